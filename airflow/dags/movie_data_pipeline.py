@@ -1,19 +1,31 @@
 """
 Airflow DAG for the FARAGNY movie data pipeline.
 
-This DAG runs weekly and performs two sequential tasks:
-1. Clean the raw movie dataset (clean_data.py)
-2. Rebuild the Chroma vector store (update_vectors.py)
+This DAG runs weekly and performs the following tasks:
+1. Clean the raw movie dataset (clean_data.py) and rebuild the SQLite catalog
+   (db/catalog.db), skipped when data/data.csv is unchanged
+2. Plan vector shards over the processed dataset, writing each shard's input once (update_vectors.py)
+3. Embed each shard in parallel via dynamic task mapping; unchanged shards are reused
+4. Merge the shards into the Chroma vector store, skipped when no shard changed
+5. Generate resized WebP poster variants for local posters (posters.py)
+
+Every task returns its duration, row count and whether it was skipped, so
+per-stage stats are visible in the task XComs.
+
+Local test run with the fake embedder (from the repository root, which must be
+on the path for the ``pipelines`` imports):
+    PYTHONPATH=. FARAGNY_EMBEDDINGS=hash python airflow/dags/movie_data_pipeline.py
 """
 
 from datetime import timedelta
 from airflow import DAG
-from airflow.operators.python import PythonOperator
+from airflow.decorators import task
 from airflow.utils.dates import days_ago
 
 # Import the pipeline functions
-from pipelines.clean_data import clean_movies_dataset
-from pipelines.update_vectors import refresh_vector_store
+from pipelines.clean_data import clean_if_changed
+from pipelines.posters import generate_poster_variants
+from pipelines.update_vectors import DEFAULT_SHARD_SIZE, build_shard, merge_shards, plan_shards
 
 
 default_args = {
@@ -33,19 +45,40 @@ with DAG(
     start_date=days_ago(1),
     catchup=False,
     tags=["faragny", "movies", "etl"],
+    params={"shard_size": DEFAULT_SHARD_SIZE},
 ) as dag:
 
-    clean_data_task = PythonOperator(
-        task_id="clean_movie_data",
-        python_callable=clean_movies_dataset,
-        doc="Cleans the raw Kaggle dataset and exports processed_movies.csv",
-    )
+    @task(task_id="clean_movie_data")
+    def clean_movie_data() -> dict:
+        """Cleans the raw Kaggle dataset and exports processed_movies.csv"""
+        return clean_if_changed()
+
+    @task(task_id="plan_vector_shards")
+    def plan_vector_shards(clean_stats: dict, params=None) -> list:
+        """Splits the processed dataset into fingerprinted shards"""
+        return plan_shards(clean_stats["output_path"], shard_size=int(params["shard_size"]))
+
+    @task(task_id="build_vector_shard", max_active_tis_per_dagrun=8)
+    def build_vector_shard(shard: dict) -> dict:
+        """Embeds one shard of the processed dataset"""
+        return build_shard(shard)
+
+    @task(task_id="update_vector_store")
+    def update_vector_store(shard_stats: list) -> dict:
+        """Rebuilds the Chroma vector store from the embedded shards"""
+        return merge_shards(list(shard_stats))
+
+    @task(task_id="build_poster_variants")
+    def build_poster_variants(clean_stats: dict) -> dict:
+        """Generates content-hashed WebP thumbnails for local posters"""
+        return generate_poster_variants()
+
+    # clean -> plan -> build shards (mapped, parallel) -> merge; posters alongside
+    cleaned = clean_movie_data()
+    shards = plan_vector_shards(cleaned)
+    update_vector_store(build_vector_shard.expand(shard=shards))
+    build_poster_variants(cleaned)
 
-    update_vectors_task = PythonOperator(
-        task_id="update_vector_store",
-        python_callable=refresh_vector_store,
-        doc="Rebuilds the Chroma vector store from the processed dataset",
-    )
 
-    # Set task dependencies: clean_data runs first, then update_vectors
-    clean_data_task >> update_vectors_task
+if __name__ == "__main__":
+    dag.test()
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, Integer, String, ForeignKey, UniqueConstraint
+from sqlalchemy import create_engine, inspect, Column, Integer, String, ForeignKey, UniqueConstraint, LargeBinary
 from sqlalchemy.orm import sessionmaker, relationship, declarative_base
 
 DATABASE_URL = "sqlite:///./db/users.db"
@@ -16,6 +16,7 @@ class User(Base):
     password_hash = Column(String, nullable=False)
 
     watchlist = relationship("UserWatchlist", back_populates="user", cascade="all, delete-orphan")
+    taste = relationship("UserTasteVector", back_populates="user", uselist=False, cascade="all, delete-orphan")
 
 
 class UserWatchlist(Base):
@@ -32,6 +33,24 @@ class UserWatchlist(Base):
     )
 
 
+class UserTasteVector(Base):
+    """Mean embedding of the movies in a user's watchlist, kept in step with UserWatchlist."""
+
+    __tablename__ = "user_taste_vector"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    # Number of watchlist movies folded into the mean (movies without an embedding are skipped)
+    count = Column(Integer, nullable=False, default=0)
+    # Packed float32 values; NULL when count is 0
+    vector = Column(LargeBinary, nullable=True)
+    # vector.store_version() the mean was built against; rebuilt when the store changes
+    store_version = Column(String, nullable=True)
+    # Watchlist entries the mean accounts for (with or without an embedding); rebuilt on mismatch
+    watchlist_size = Column(Integer, nullable=False, default=0)
+
+    user = relationship("User", back_populates="taste")
+
+
 def get_db():
     """Dependency to get database session."""
     db = SessionLocal()
@@ -43,5 +62,11 @@ def get_db():
 
 def init_db():
     """Create all tables."""
+    table = UserTasteVector.__tablename__
+    inspector = inspect(engine)
+    expected = {column.name for column in UserTasteVector.__table__.columns}
+    if inspector.has_table(table) and not expected <= {c["name"] for c in inspector.get_columns(table)}:
+        # Derived data: tables from older versions are dropped and every row rebuilt on its next read
+        UserTasteVector.__table__.drop(bind=engine)
     Base.metadata.create_all(bind=engine)
 
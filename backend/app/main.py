@@ -1,12 +1,57 @@
+from contextlib import asynccontextmanager
+import re
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from .database import init_db
+from .services import data as data_svc
+from .services import profiling
+from .services import vector as vector_svc
+from .services import warmup
+
+# Content-hashed poster variants (pipelines/posters.py: <16 hex>-w<width>.webp) never change
+# under the same URL; the manifest and temp files next to them do
+IMMUTABLE_STATIC_RE = re.compile(r"posters/derived/[0-9a-f]{16}-w\d+\.webp")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Responses smaller than this are sent uncompressed; gzip only when the client accepts it
+GZIP_MINIMUM_SIZE = 1024
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that marks content-hashed assets as cacheable forever."""
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if IMMUTABLE_STATIC_RE.fullmatch(self.get_path(scope).replace("\\", "/")):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+
+class ApiGZipMiddleware(GZipMiddleware):
+    """GZip for API responses; static assets (already-compressed images) pass through."""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith("/static/"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Initialize database tables
+    init_db()
+    # Load the catalog, indexes and vector store in the background; /readyz flips once done
+    warmup.start()
+    yield
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="Movie Recommendation Platform")
+    app = FastAPI(title="Movie Recommendation Platform", lifespan=lifespan)
 
     # Open CORS for MVP; restrict in production
     app.add_middleware(
@@ -16,9 +61,32 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    app.add_middleware(ApiGZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE)
+    # Only installed when a profiling token or sample rate is configured
+    if profiling.enabled():
+        app.add_middleware(profiling.ProfilingMiddleware)
 
     # Serve local assets (e.g., posters) from the data folder if available
-    app.mount("/static", StaticFiles(directory="data"), name="static")
+    app.mount("/static", CachedStaticFiles(directory="data"), name="static")
+
+    @app.get("/healthz", tags=["health"])
+    def healthz():
+        """Liveness: the process is up and serving requests."""
+        return {"status": "ok"}
+
+    @app.get("/readyz", tags=["health"])
+    def readyz():
+        """Readiness: the catalog, indexes and vector store are warm."""
+        body = warmup.status()
+        return JSONResponse(status_code=200 if warmup.is_ready() else 503, content=body)
+
+    @app.get("/metrics", tags=["health"])
+    def metrics():
+        """Runtime counters for in-process caches and limiters."""
+        return {
+            "filter_cache": data_svc.filter_cache_stats(),
+            "semantic_search": vector_svc.admission_stats(),
+        }
 
     # Routers are registered in run_app to avoid circular imports on module import
     return app
@@ -28,9 +96,6 @@ app = create_app()
 
 
 def run_app() -> FastAPI:
-    # Initialize database tables
-    init_db()
-    
     # Import routers here to ensure app is created first
     from .routers.auth import router as auth_router
     from .routers.movies import router as movies_router
@@ -44,5 +109,3 @@ def run_app() -> FastAPI:
 
 # Ensure routers are mounted when running via uvicorn
 run_app()
-
-
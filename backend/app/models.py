@@ -1,5 +1,5 @@
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class Movie(BaseModel):
@@ -9,6 +9,7 @@ class Movie(BaseModel):
     genres: List[str] = []
     production_companies: List[str] = []
     poster_url: Optional[str] = None
+    poster_srcset: Optional[str] = None
     runtime: Optional[int] = None
     original_language: Optional[str] = None
     vote_average: Optional[float] = None
@@ -21,6 +22,8 @@ class MovieListResponse(BaseModel):
     total: int
     limit: int
     offset: int
+    # Opaque keyset cursor for the next page; None on the last page or for unpaginated lists
+    next_cursor: Optional[str] = None
 
 
 class SimilarTextRequest(BaseModel):
@@ -30,3 +33,14 @@ class SimilarTextRequest(BaseModel):
     k: int = 10
 
 
+# Upper bound on queries per /movies/similar-text/batch call
+SIMILAR_TEXT_BATCH_MAX = 32
+
+
+class SimilarTextBatchRequest(BaseModel):
+    queries: List[SimilarTextRequest] = Field(..., min_length=1, max_length=SIMILAR_TEXT_BATCH_MAX)
+
+
+class MovieListBatchResponse(BaseModel):
+    # One list per query, in request order
+    results: List[MovieListResponse]
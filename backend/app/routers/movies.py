@@ -1,13 +1,55 @@
-from typing import List, Optional
-from fastapi import APIRouter, Query, HTTPException, Depends
+from typing import List, Optional, Tuple
+from fastapi import APIRouter, Query, HTTPException, Depends, Response
 from pydantic import BaseModel
+from sqlalchemy.orm import Session
 
-from ..models import Movie, MovieListResponse, SimilarTextRequest
+from ..database import get_db, User, UserWatchlist
+from ..models import Movie, MovieListBatchResponse, MovieListResponse, SimilarTextBatchRequest, SimilarTextRequest
 from ..services import data as data_svc
+from ..services import profiling
+from ..services import taste as taste_svc
 from ..services import vector as vector_svc
+from ..services.admission import Saturated
 from .auth import get_current_user
 
-router = APIRouter()
+router = APIRouter(route_class=profiling.route_class())
+
+# Seconds clients should wait before retrying a shed semantic request
+RETRY_AFTER_SECONDS = 2
+
+
+def _overloaded(exc: Saturated) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail=f"Semantic search is overloaded, try again shortly ({exc})",
+        headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+    )
+
+
+def movie_fields(
+    fields: Optional[str] = Query(
+        default=None,
+        description="Comma-separated movie fields to return (id is always included)",
+    ),
+    view: Optional[str] = Query(default=None, regex="^(card|full)$", description="Named field set; ignored when fields is given"),
+) -> Optional[Tuple[str, ...]]:
+    """Projection shared by every movie-list endpoint; None means all fields."""
+    try:
+        return data_svc.resolve_fields(fields, view)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+def _movie_list(items: List[dict], total: int, limit: int, offset: int = 0, next_cursor: Optional[str] = None) -> MovieListResponse:
+    # Routes use response_model_exclude_unset so projected-away fields stay out of the
+    # payload; the envelope is always set explicitly so it is always serialized.
+    return MovieListResponse(
+        items=[Movie(**m) for m in items],
+        total=total,
+        limit=limit,
+        offset=offset,
+        next_cursor=next_cursor,
+    )
 
 
 def _docs_to_movie_ids(docs) -> List[int]:
@@ -20,42 +62,53 @@ def _docs_to_movie_ids(docs) -> List[int]:
 
 
 # Static routes MUST come before dynamic /{movie_id} route
-@router.get("/search", response_model=MovieListResponse)
+@router.get("/search", response_model=MovieListResponse, response_model_exclude_unset=True)
 def search_movies(
+    response: Response,
     q: str = Query(..., description="Query text"),
     mode: str = Query("auto", regex="^(auto|title|semantic)$"),
     limit: int = 20,
+    fields: Optional[Tuple[str, ...]] = Depends(movie_fields),
     user: str = Depends(get_current_user),
 ):
     items: List[dict]
     total: int
+    title_hits: Optional[List[dict]] = None
 
     if mode in ("title", "auto"):
-        title_hits = data_svc.search_title(q, limit=limit)
+        title_hits = data_svc.search_title(q, limit=limit, fields=fields)
         if mode == "title" or (mode == "auto" and len(title_hits) > 0):
             items = title_hits
             total = len(title_hits)
-            return MovieListResponse(items=[Movie(**m) for m in items], total=total, limit=limit, offset=0)
+            return _movie_list(items, total, limit)
 
     # semantic fallback
-    docs = vector_svc.search_similar(q, k=limit)
-    ids = _docs_to_movie_ids(docs)
-    # Fetch movies by id (dedupe while preserving order)
-    seen = set()
-    movies: List[dict] = []
-    for mid in ids:
-        if mid in seen:
-            continue
-        seen.add(mid)
-        m = data_svc.get_movie_by_id(mid)
-        if m:
-            movies.append(m)
-    items = movies
+    try:
+        docs = vector_svc.search_similar(q, k=limit)
+    except Saturated:
+        # Embedding backlog: answer from the title index instead of queueing behind it
+        response.headers["X-Search-Degraded"] = "title"
+        items = title_hits if title_hits is not None else data_svc.search_title(q, limit=limit, fields=fields)
+        return _movie_list(items, len(items), limit)
+    # Fetch movies by id in one pass (deduped, order preserved)
+    items = data_svc.get_movies_by_ids(_docs_to_movie_ids(docs), fields=fields)
     total = len(items)
-    return MovieListResponse(items=[Movie(**m) for m in items], total=total, limit=limit, offset=0)
+    return _movie_list(items, total, limit)
+
+
+@router.get("/autocomplete", response_model=MovieListResponse, response_model_exclude_unset=True)
+def autocomplete(
+    prefix: str = Query(..., description="Beginning of a title"),
+    limit: int = Query(default=data_svc.AUTOCOMPLETE_TOP_K, ge=1, le=data_svc.AUTOCOMPLETE_TOP_K),
+    fields: Optional[Tuple[str, ...]] = Depends(movie_fields),
+    user: str = Depends(get_current_user),
+):
+    """Title suggestions from the precomputed prefix index; no catalog scan, no embedding."""
+    items = data_svc.autocomplete(prefix, limit=limit, fields=fields)
+    return _movie_list(items, len(items), limit)
 
 
-@router.get("/filter", response_model=MovieListResponse)
+@router.get("/filter", response_model=MovieListResponse, response_model_exclude_unset=True)
 def filter_endpoint(
     genres: Optional[List[str]] = Query(default=None),
     production_companies: Optional[List[str]] = Query(default=None),
@@ -67,21 +120,28 @@ def filter_endpoint(
     popularity_min: Optional[float] = None,
     limit: int = 20,
     offset: int = 0,
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page; overrides offset"),
+    fields: Optional[Tuple[str, ...]] = Depends(movie_fields),
     user: str = Depends(get_current_user),
 ):
-    items, total = data_svc.filter_movies(
-        genres=genres,
-        production_companies=production_companies,
-        runtime_min=runtime_min,
-        runtime_max=runtime_max,
-        language=language,
-        vote_average_min=vote_average_min,
-        vote_count_min=vote_count_min,
-        popularity_min=popularity_min,
-        limit=limit,
-        offset=offset,
-    )
-    return MovieListResponse(items=[Movie(**m) for m in items], total=total, limit=limit, offset=offset)
+    try:
+        page = data_svc.filter_movies(
+            genres=genres,
+            production_companies=production_companies,
+            runtime_min=runtime_min,
+            runtime_max=runtime_max,
+            language=language,
+            vote_average_min=vote_average_min,
+            vote_count_min=vote_count_min,
+            popularity_min=popularity_min,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            fields=fields,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return _movie_list(page.items, page.total, limit, offset=page.offset, next_cursor=page.next_cursor)
 
 
 @router.get("/facets")
@@ -89,9 +149,8 @@ def facets(user: str = Depends(get_current_user)):
     return data_svc.facets()
 
 
-@router.post("/similar-text", response_model=MovieListResponse)
-def similar_by_text(payload: SimilarTextRequest, user: str = Depends(get_current_user)):
-    text = " ".join(
+def _similar_text_query(payload: SimilarTextRequest) -> str:
+    return " ".join(
         filter(
             None,
             [
@@ -101,27 +160,89 @@ def similar_by_text(payload: SimilarTextRequest, user: str = Depends(get_current
             ],
         )
     )
-    docs = vector_svc.search_similar(text, k=payload.k)
-    ids = _docs_to_movie_ids(docs)
-    items = []
-    for mid in ids:
-        m = data_svc.get_movie_by_id(mid)
-        if m:
-            items.append(m)
-    return MovieListResponse(items=[Movie(**m) for m in items], total=len(items), limit=payload.k, offset=0)
+
+
+@router.post("/similar-text", response_model=MovieListResponse, response_model_exclude_unset=True)
+def similar_by_text(
+    payload: SimilarTextRequest,
+    fields: Optional[Tuple[str, ...]] = Depends(movie_fields),
+    user: str = Depends(get_current_user),
+):
+    text = _similar_text_query(payload)
+    try:
+        docs = vector_svc.search_similar(text, k=payload.k)
+    except Saturated as exc:
+        raise _overloaded(exc)
+    items = data_svc.get_movies_by_ids(_docs_to_movie_ids(docs), fields=fields)
+    return _movie_list(items, len(items), payload.k)
+
+
+@router.post("/similar-text/batch", response_model=MovieListBatchResponse, response_model_exclude_unset=True)
+def similar_by_text_batch(
+    payload: SimilarTextBatchRequest,
+    fields: Optional[Tuple[str, ...]] = Depends(movie_fields),
+    user: str = Depends(get_current_user),
+):
+    """Several /similar-text queries with one embedding call, one vector search and one catalog pass."""
+    queries = payload.queries
+    try:
+        id_lists = vector_svc.search_similar_ids_batch(
+            [_similar_text_query(q) for q in queries], k=max(q.k for q in queries)
+        )
+    except Saturated as exc:
+        raise _overloaded(exc)
+    id_lists = [ids[: q.k] for q, ids in zip(queries, id_lists)]
+    movies = {m["id"]: m for m in data_svc.get_movies_by_ids([mid for ids in id_lists for mid in ids], fields=fields)}
+    results = []
+    for q, ids in zip(queries, id_lists):
+        items = [movies[mid] for mid in dict.fromkeys(ids) if mid in movies]
+        results.append(_movie_list(items, len(items), q.k))
+    return MovieListBatchResponse(results=results)
+
+
+@router.get("/for-you", response_model=MovieListResponse, response_model_exclude_unset=True)
+def for_you(
+    k: int = 20,
+    fields: Optional[Tuple[str, ...]] = Depends(movie_fields),
+    username: str = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Movies closest to the user's taste vector (mean embedding of their watchlist)."""
+    user = db.query(User).filter(User.username == username).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    watchlist_ids = [row.movie_id for row in db.query(UserWatchlist.movie_id).filter(UserWatchlist.user_id == user.id)]
+    taste = taste_svc.get_taste_vector(db, user.id, watchlist_ids)
+    if taste is None:
+        return _movie_list([], 0, k)
+
+    docs = vector_svc.search_by_vector(taste, k=k, exclude_ids=watchlist_ids)
+    excluded = set(watchlist_ids)
+    ids = [mid for mid in _docs_to_movie_ids(docs) if mid not in excluded]
+    items = data_svc.get_movies_by_ids(ids, fields=fields)
+    return _movie_list(items, len(items), k)
 
 
 # Dynamic routes with path parameters MUST come after static routes
-@router.get("/{movie_id}", response_model=Movie)
-def get_movie(movie_id: int, user: str = Depends(get_current_user)):
-    movie = data_svc.get_movie_by_id(movie_id)
+@router.get("/{movie_id}", response_model=Movie, response_model_exclude_unset=True)
+def get_movie(
+    movie_id: int,
+    fields: Optional[Tuple[str, ...]] = Depends(movie_fields),
+    user: str = Depends(get_current_user),
+):
+    movie = data_svc.get_movie_by_id(movie_id, fields=fields)
     if not movie:
         raise HTTPException(status_code=404, detail="Movie not found")
-    return movie
+    return Movie(**movie)
 
 
-@router.get("/{movie_id}/similar", response_model=MovieListResponse)
-def similar_movies(movie_id: int, k: int = 10, user: str = Depends(get_current_user)):
+@router.get("/{movie_id}/similar", response_model=MovieListResponse, response_model_exclude_unset=True)
+def similar_movies(
+    movie_id: int,
+    k: int = 10,
+    fields: Optional[Tuple[str, ...]] = Depends(movie_fields),
+    user: str = Depends(get_current_user),
+):
     base = data_svc.get_movie_by_id(movie_id)
     if not base:
         raise HTTPException(status_code=404, detail="Movie not found")
@@ -135,17 +256,10 @@ def similar_movies(movie_id: int, k: int = 10, user: str = Depends(get_current_u
             ],
         )
     )
-    docs = vector_svc.search_similar(text, k=k + 5)  # fetch a bit more to filter out self
-    ids = _docs_to_movie_ids(docs)
-    items: List[dict] = []
-    seen = {movie_id}
-    for mid in ids:
-        if mid in seen:
-            continue
-        seen.add(mid)
-        m = data_svc.get_movie_by_id(mid)
-        if m:
-            items.append(m)
-        if len(items) >= k:
-            break
-    return MovieListResponse(items=[Movie(**m) for m in items], total=len(items), limit=k, offset=0)
+    try:
+        docs = vector_svc.search_similar(text, k=k + 5)  # fetch a bit more to filter out self
+    except Saturated as exc:
+        raise _overloaded(exc)
+    ids = [mid for mid in _docs_to_movie_ids(docs) if mid != movie_id]
+    items = data_svc.get_movies_by_ids(ids, fields=fields)[:k]
+    return _movie_list(items, len(items), k)
@@ -1,13 +1,16 @@
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
 
 from ..database import get_db, User, UserWatchlist
-from ..services.data import get_movie_by_id
+from ..services.data import get_movie_by_id, get_movies_by_ids
+from ..services import profiling
+from ..services import taste as taste_svc
 from .auth import get_current_user
+from .movies import movie_fields
 
-router = APIRouter()
+router = APIRouter(route_class=profiling.route_class())
 
 
 class WatchlistResponse(BaseModel):
@@ -25,6 +28,7 @@ class MovieResponse(BaseModel):
     genres: List[str] = []
     production_companies: List[str] = []
     poster_url: str | None = None
+    poster_srcset: str | None = None
     runtime: int | None = None
     original_language: str | None = None
     vote_average: float | None = None
@@ -37,8 +41,9 @@ class WatchlistMoviesResponse(BaseModel):
     total: int
 
 
-@router.get("", response_model=WatchlistMoviesResponse)
+@router.get("", response_model=WatchlistMoviesResponse, response_model_exclude_unset=True)
 def get_watchlist(
+    fields: Optional[Tuple[str, ...]] = Depends(movie_fields),
     username: str = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -51,14 +56,10 @@ def get_watchlist(
     watchlist_items = db.query(UserWatchlist).filter(UserWatchlist.user_id == user.id).all()
     movie_ids = [item.movie_id for item in watchlist_items]
     
-    # Fetch movie details for each ID
-    movies = []
-    for movie_id in movie_ids:
-        movie_data = get_movie_by_id(movie_id)
-        if movie_data:
-            movies.append(movie_data)
+    # Fetch movie details for all IDs in one catalog pass
+    movies = get_movies_by_ids(movie_ids, fields=fields)
     
-    return WatchlistMoviesResponse(items=movies, total=len(movies))
+    return WatchlistMoviesResponse(items=[MovieResponse(**m) for m in movies], total=len(movies))
 
 
 @router.get("/ids", response_model=WatchlistResponse)
@@ -105,6 +106,7 @@ def add_to_watchlist(
     # Add to watchlist
     watchlist_item = UserWatchlist(user_id=user.id, movie_id=movie_id)
     db.add(watchlist_item)
+    taste_svc.on_added(db, user.id, movie_id)
     db.commit()
     
     return MessageResponse(message="Movie added to watchlist")
@@ -131,6 +133,7 @@ def remove_from_watchlist(
         raise HTTPException(status_code=404, detail="Movie not in watchlist")
     
     db.delete(watchlist_item)
+    taste_svc.on_removed(db, user.id, movie_id)
     db.commit()
     
     return MessageResponse(message="Movie removed from watchlist")
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+import contextvars
+from typing import Any, Callable, Dict, Optional
+import threading
+
+
+class Saturated(Exception):
+    """The limiter refused or abandoned a call (queue full or deadline exceeded)."""
+
+
+class AdmissionLimiter:
+    """
+    Bounded concurrency with a queue-depth cap and per-call deadlines.
+
+    Calls run on a dedicated pool of ``max_concurrency`` threads, so a slow
+    dependency can tie up at most that many threads instead of the whole
+    request threadpool. Once ``max_queue`` calls are already waiting, new calls
+    are rejected immediately. A caller whose deadline passes gets ``Saturated``
+    right away; the abandoned call still finishes in the background and keeps
+    its slot until it does, so the cap stays honest.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int, timeout: float) -> None:
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix=f"{name}-")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def _wrap(self, fn: Callable[..., Any], args, kwargs) -> Any:
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def run(self, fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None, **kwargs: Any) -> Any:
+        with self._lock:
+            if self._pending >= self.max_concurrency + self.max_queue:
+                self.rejected += 1
+                raise Saturated(f"{self.name}: queue full")
+            self._pending += 1
+            self.admitted += 1
+        # Run in the caller's context so request-scoped state (e.g. an active profile) follows the call
+        future = self._executor.submit(contextvars.copy_context().run, self._wrap, fn, args, kwargs)
+        future.add_done_callback(self._release)
+        try:
+            return future.result(timeout=self.timeout if timeout is None else timeout)
+        except FuturesTimeout:
+            # Drops it from the queue if it has not started yet
+            future.cancel()
+            with self._lock:
+                self.timed_out += 1
+            raise Saturated(f"{self.name}: deadline exceeded")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "max_queue": self.max_queue,
+                "timeout_seconds": self.timeout,
+                "in_flight": self._running,
+                "queue_depth": max(self._pending - self._running, 0),
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+            }
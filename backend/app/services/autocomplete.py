@@ -0,0 +1,149 @@
+"""
+Title normalization and top-k-per-prefix ranking for autocomplete.
+
+Shared by the in-memory index below and ``pipelines.catalog_db``, which
+precomputes the same answers into the SQLite catalog; the pipeline imports
+this module from the repository root, so it depends on nothing else in the app.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Sequence, Tuple
+import re
+import unicodedata
+
+import numpy as np
+
+_NON_ALNUM_RE = re.compile(r"[^0-9a-z]+")
+# Titles are also indexed without these, so "dark kn" finds "The Dark Knight"
+LEADING_ARTICLES = ("the ", "a ", "an ")
+# Suggestions kept per title prefix, and the match count below which a prefix is ranked on demand
+TOP_K = 10
+SCAN_LIMIT = 64
+
+
+def normalize_title(text: str) -> str:
+    """Lowercase, strip accents and punctuation, collapse whitespace."""
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return _NON_ALNUM_RE.sub(" ", text.lower()).strip()
+
+
+def lookup_key(prefix: str) -> str:
+    """Normalized search key for a typed prefix ("" when nothing searchable is left)."""
+    key = normalize_title(prefix)
+    if key and normalize_title(prefix + "x").endswith(" x"):
+        # A trailing separator means the last word is complete: "secret " should not match "Secrets"
+        key += " "
+    return key
+
+
+def next_key(prefix: str) -> str:
+    """Smallest string greater than every string starting with ``prefix``."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def index_keys(titles: Sequence) -> List[Tuple[str, int]]:
+    """
+    Sorted (key, position) pairs for ``titles``: every normalized title, plus
+    its form without a leading article. Non-string and empty titles are skipped.
+    """
+    pairs = []
+    for pos, title in enumerate(titles):
+        if not isinstance(title, str):
+            continue
+        key = normalize_title(title)
+        if not key:
+            continue
+        pairs.append((key, pos))
+        if key.startswith(LEADING_ARTICLES):
+            # normalize_title strips trailing spaces, so a bare "the" never gets here
+            pairs.append((key.split(" ", 1)[1], pos))
+    pairs.sort()
+    return pairs
+
+
+def best_positions(positions: np.ndarray, ranks: np.ndarray, limit: int) -> np.ndarray:
+    """Most popular distinct ``positions`` (lowest ``ranks``), best first."""
+    # A row has at most two keys, so 2 * limit candidates always hold `limit` distinct rows
+    want = min(2 * limit, len(ranks))
+    if want < len(ranks):
+        candidates = np.argpartition(ranks, want - 1)[:want]
+    else:
+        candidates = np.arange(len(ranks))
+    candidates = candidates[np.argsort(ranks[candidates], kind="stable")]
+    best = positions[candidates]
+    _, first = np.unique(best, return_index=True)
+    return best[np.sort(first)][:limit]
+
+
+def prefix_tops(
+    keys: List[str], positions: np.ndarray, ranks: np.ndarray, top_k: int = TOP_K, scan_limit: int = SCAN_LIMIT
+) -> Iterator[Tuple[str, np.ndarray]]:
+    """
+    Yield (prefix, top ``top_k`` positions) for every prefix matching more than
+    ``scan_limit`` of the sorted ``keys``; ``ranks[i]`` is the popularity rank
+    of ``positions[i]``.
+    """
+    # Iterative walk over the implicit trie; only nodes too big to scan are materialized
+    stack = [("", 0, len(keys))]
+    while stack:
+        prefix, lo, hi = stack.pop()
+        if hi - lo <= scan_limit:
+            continue
+        yield prefix, best_positions(positions[lo:hi], ranks[lo:hi], top_k)
+        depth = len(prefix)
+        # Keys equal to the prefix sort first and have no child
+        start = lo
+        while start < hi and len(keys[start]) == depth:
+            start += 1
+        while start < hi:
+            child = prefix + keys[start][depth]
+            end = bisect_left(keys, next_key(child), start, hi)
+            stack.append((child, start, end))
+            start = end
+
+
+class PrefixIndex:
+    """
+    Sorted-prefix index over normalized titles with precomputed top-k per prefix.
+
+    Keys are kept sorted, so every prefix maps to one contiguous range found
+    with two bisects. Prefixes matching more than ``scan_limit`` keys (the
+    trie nodes a short prefix lands on) store their ``top_k`` most popular
+    rows at build time; every other prefix has at most ``scan_limit``
+    matches, which are ranked on the spot. Either way a lookup never touches
+    more than ``scan_limit`` entries.
+
+    ``ranks[pos]`` is the catalog popularity rank of row ``pos`` (0 = most
+    popular); lookups return catalog row positions.
+    """
+
+    def __init__(self, titles: Sequence, ranks: np.ndarray, top_k: int = TOP_K, scan_limit: int = SCAN_LIMIT) -> None:
+        self.top_k = top_k
+        self.scan_limit = scan_limit
+        pairs = index_keys(titles)
+        self._keys: List[str] = [key for key, _ in pairs]
+        self._positions = np.array([pos for _, pos in pairs], dtype=np.int64)
+        self._ranks = np.asarray(ranks, dtype=np.int64)[self._positions] if pairs else np.empty(0, dtype=np.int64)
+        self._top: Dict[str, np.ndarray] = dict(
+            prefix_tops(self._keys, self._positions, self._ranks, top_k=top_k, scan_limit=scan_limit)
+        )
+
+    def lookup(self, prefix: str, limit: int = 10) -> np.ndarray:
+        """Catalog row positions of the most popular titles starting with ``prefix``."""
+        key = lookup_key(prefix)
+        limit = min(limit, self.top_k)
+        if not key or limit <= 0:
+            return np.empty(0, dtype=np.int64)
+        top = self._top.get(key)
+        if top is not None:
+            return top[:limit]
+        lo = bisect_left(self._keys, key)
+        hi = bisect_left(self._keys, next_key(key), lo)
+        return best_positions(self._positions[lo:hi], self._ranks[lo:hi], limit)
+
+    def stats(self) -> Dict[str, int]:
+        return {"keys": len(self._keys), "precomputed_prefixes": len(self._top), "top_k": self.top_k}
@@ -0,0 +1,298 @@
+"""
+SQLite catalog backend (``FARAGNY_CATALOG_BACKEND=sqlite``).
+
+Serves the catalog functions of ``services.data`` from the database built by
+``pipelines.catalog_db`` instead of a per-process DataFrame: nothing is loaded
+up front, so startup is instant and memory stays flat as the catalog grows.
+Results match the pandas backend (``python -m benchmarks.parity`` checks it),
+except that title search treats the query as a literal substring rather than
+a regular expression.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import os
+import sqlite3
+import threading
+
+from . import data as data_svc
+from . import profiling
+from .autocomplete import lookup_key, next_key
+
+CATALOG_DB_PATH = os.environ.get("FARAGNY_CATALOG_DB", os.path.join("db", "catalog.db"))
+SCHEMA_VERSION = 2
+# Page cache per connection, in KiB; the OS page cache does the rest
+CACHE_SIZE_KIB = 16 * 1024
+# Stay well below SQLite's bound-parameter limit
+MAX_IN_PARAMS = 900
+# FTS5 trigram matching needs at least three characters; shorter queries scan
+FTS_MIN_CHARS = 3
+
+# API field -> SQL expression; poster_url / poster_srcset are derived from poster_path
+_FIELD_SQL = {
+    "id": "id",
+    "title": "title",
+    "overview": "overview",
+    "genres": "genres",
+    "production_companies": "production_companies",
+    "poster_url": "poster_path",
+    "poster_srcset": "poster_path",
+    "runtime": "runtime",
+    "original_language": "original_language",
+    "vote_average": "vote_average",
+    "vote_count": "vote_count",
+    "popularity": "popularity",
+}
+
+_local = threading.local()
+_state_lock = threading.Lock()
+# Bumped by reload() so per-thread connections reopen on the new file
+_generation = 0
+_version: Optional[str] = None
+_variants: Optional[Dict[str, Dict[int, str]]] = None
+_autocomplete_top_k = 0
+
+
+def _connect() -> sqlite3.Connection:
+    if not os.path.exists(CATALOG_DB_PATH):
+        raise RuntimeError(f"Catalog database not found at {CATALOG_DB_PATH}; run the clean_movie_data pipeline")
+    conn = sqlite3.connect(f"file:{CATALOG_DB_PATH}?mode=ro", uri=True)
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB}")
+    found = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+    if found is None or int(found[0]) != SCHEMA_VERSION:
+        conn.close()
+        raise RuntimeError(f"Catalog database {CATALOG_DB_PATH} has schema {found and found[0]}, expected {SCHEMA_VERSION}")
+    return conn
+
+
+def _conn() -> sqlite3.Connection:
+    """This thread's read-only connection (sqlite3 connections are not shared across threads)."""
+    cached = getattr(_local, "conn", None)
+    if cached is not None and cached[0] == _generation:
+        return cached[1]
+    if cached is not None:
+        cached[1].close()
+    conn = _connect()
+    _local.conn = (_generation, conn)
+    return conn
+
+
+def open_catalog() -> str:
+    """Open the database and record its version (idempotent); used by the startup warmup."""
+    global _version, _variants, _autocomplete_top_k
+    if _version is None:
+        with _state_lock:
+            if _version is None:
+                found = _conn().execute("SELECT value FROM meta WHERE key = 'autocomplete_top_k'").fetchone()
+                _autocomplete_top_k = int(found[0])
+                _variants = data_svc.load_poster_manifest()
+                _version = data_svc.fingerprint(CATALOG_DB_PATH)
+    return _version
+
+
+def reload() -> str:
+    """Pick up a rebuilt database: new connections, poster manifest and version."""
+    global _generation, _version
+    with _state_lock:
+        _generation += 1
+        _version = None
+    return open_catalog()
+
+
+def dataset_version() -> str:
+    return open_catalog()
+
+
+def _columns(fields: Optional[Tuple[str, ...]]) -> Tuple[Tuple[str, ...], str]:
+    names = tuple(fields or data_svc.MOVIE_FIELDS)
+    return names, ", ".join(dict.fromkeys(_FIELD_SQL[f] for f in names))
+
+
+def _rows_to_movies(rows, names: Tuple[str, ...], sql_columns: str) -> List[Dict[str, Any]]:
+    index = {column: i for i, column in enumerate(sql_columns.split(", "))}
+    movies = []
+    # Same stage as the DataFrame backend's row materialization, so profiles compare
+    with profiling.stage("pandas"):
+        for row in rows:
+            movie: Dict[str, Any] = {}
+            for field in names:
+                value = row[index[_FIELD_SQL[field]]]
+                if field in data_svc.LIST_FIELDS:
+                    value = json.loads(value)
+                elif field == "poster_url":
+                    value = data_svc.poster_url_from_path(value, _variants)
+                elif field == "poster_srcset":
+                    value = data_svc.poster_srcset_from_path(value, _variants)
+                movie[field] = value
+            movies.append(movie)
+    return movies
+
+
+def get_movie_by_id(movie_id: int, fields: Optional[Tuple[str, ...]] = None) -> Optional[Dict[str, Any]]:
+    open_catalog()
+    names, columns = _columns(fields)
+    # Duplicated ids resolve to the first row, as in the pandas backend
+    row = _conn().execute(f"SELECT {columns} FROM movies WHERE id = ? ORDER BY pos LIMIT 1", (movie_id,)).fetchone()
+    return _rows_to_movies([row], names, columns)[0] if row else None
+
+
+def get_movies_by_ids(movie_ids: List[int], fields: Optional[Tuple[str, ...]] = None) -> List[Dict[str, Any]]:
+    open_catalog()
+    names, columns = _columns(tuple(dict.fromkeys(["id", *(fields or data_svc.MOVIE_FIELDS)])))
+    wanted = list(dict.fromkeys(int(mid) for mid in movie_ids))
+    found: Dict[int, Dict[str, Any]] = {}
+    for start in range(0, len(wanted), MAX_IN_PARAMS):
+        chunk = wanted[start : start + MAX_IN_PARAMS]
+        rows = _conn().execute(
+            f"SELECT {columns} FROM movies WHERE id IN ({', '.join('?' * len(chunk))}) ORDER BY pos", chunk
+        ).fetchall()
+        for movie in _rows_to_movies(rows, names, columns):
+            found.setdefault(movie["id"], movie)
+    movies = [found[mid] for mid in wanted if mid in found]
+    if fields and "id" not in fields:
+        for movie in movies:
+            del movie["id"]
+    return movies
+
+
+def _movies_at(positions, fields: Optional[Tuple[str, ...]]) -> List[Dict[str, Any]]:
+    names, columns = _columns(fields)
+    positions = [int(p) for p in positions]
+    if not positions:
+        return []
+    rows = _conn().execute(
+        f"SELECT pos, {columns} FROM movies WHERE pos IN ({', '.join('?' * len(positions))})", positions
+    ).fetchall()
+    by_pos = {row[0]: row[1:] for row in rows}
+    return _rows_to_movies([by_pos[p] for p in positions], names, columns)
+
+
+def autocomplete(prefix: str, limit: int, fields: Optional[Tuple[str, ...]] = None) -> List[Dict[str, Any]]:
+    """
+    Same answers as ``autocomplete.PrefixIndex``, from the tables the pipeline
+    precomputed: busy prefixes are one primary-key read, the rest a short
+    range scan of ``title_keys``.
+    """
+    open_catalog()
+    key = lookup_key(prefix)
+    limit = min(limit, _autocomplete_top_k)
+    if not key or limit <= 0:
+        return []
+    conn = _conn()
+    with profiling.stage("catalog_filter"):
+        top = conn.execute("SELECT positions FROM title_prefixes WHERE prefix = ?", (key,)).fetchone()
+        if top is not None:
+            positions = json.loads(top[0])[:limit]
+        else:
+            rows = conn.execute(
+                "SELECT pos FROM title_keys WHERE key >= ? AND key < ? ORDER BY listing_rank",
+                (key, next_key(key)),
+            ).fetchall()
+            positions = list(dict.fromkeys(pos for (pos,) in rows))[:limit]
+    return _movies_at(positions, fields)
+
+
+def search_title(q: str, limit: int = 20, fields: Optional[Tuple[str, ...]] = None) -> List[Dict[str, Any]]:
+    open_catalog()
+    names, columns = _columns(fields)
+    with profiling.stage("catalog_filter"):
+        if len(q) >= FTS_MIN_CHARS:
+            # A quoted trigram phrase is a case-insensitive substring match
+            phrase = '"' + q.replace('"', '""') + '"'
+            sql = f"SELECT {columns} FROM movies WHERE pos IN (SELECT rowid FROM titles_fts WHERE titles_fts MATCH ?) ORDER BY pos LIMIT ?"
+            params: Tuple[Any, ...] = (phrase, limit)
+        else:
+            pattern = "%" + q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            sql = f"SELECT {columns} FROM movies WHERE title LIKE ? ESCAPE '\\' ORDER BY pos LIMIT ?"
+            params = (pattern, limit)
+        rows = _conn().execute(sql, params).fetchall()
+    return _rows_to_movies(rows, names, columns)
+
+
+def _where(criteria: Dict[str, Any]) -> Tuple[str, List[Any]]:
+    """SQL conditions equivalent to ``data._filter_mask`` for normalized criteria."""
+    clauses: List[str] = []
+    params: List[Any] = []
+    for table, key in (("movie_genres", "genres"), ("movie_companies", "production_companies")):
+        names = criteria.get(key)
+        if names:
+            clauses.append(
+                f"EXISTS (SELECT 1 FROM {table} j WHERE j.pos = movies.pos AND j.name_key IN ({', '.join('?' * len(names))}))"
+            )
+            params.extend(names)
+    bounds = (
+        ("runtime_min", "COALESCE(runtime, 0) >= ?"),
+        ("runtime_max", "COALESCE(runtime, 10000) <= ?"),
+        ("vote_average_min", "COALESCE(vote_average, 0) >= ?"),
+        ("vote_count_min", "COALESCE(vote_count, 0) >= ?"),
+        ("popularity_min", "COALESCE(popularity, 0) >= ?"),
+    )
+    for key, clause in bounds:
+        if criteria.get(key) is not None:
+            clauses.append(clause)
+            params.append(criteria[key])
+    if criteria.get("language"):
+        clauses.append("language_key = ?")
+        params.append(criteria["language"])
+    return (" AND ".join(clauses) or "1"), params
+
+
+def _cursor_rank(decoded: Dict[str, Any]) -> int:
+    """Listing rank of the first row after the cursor's (sort key, id)."""
+    conn = _conn()
+    row = conn.execute(
+        "SELECT listing_rank FROM movies WHERE (neg_popularity, id) > (?, ?) ORDER BY neg_popularity, id LIMIT 1",
+        (decoded["k"], decoded["i"]),
+    ).fetchone()
+    if row is not None:
+        return row[0]
+    return conn.execute("SELECT COUNT(*) FROM movies").fetchone()[0]
+
+
+def filter_movies(
+    criteria: Dict[str, Any],
+    filter_hash: str,
+    limit: int,
+    offset: int,
+    decoded: Optional[Dict[str, Any]],
+    fields: Optional[Tuple[str, ...]] = None,
+) -> "data_svc.FilterPage":
+    open_catalog()
+    names, columns = _columns(fields)
+    where, params = _where(criteria)
+    conn = _conn()
+    with profiling.stage("catalog_filter"):
+        if decoded is not None:
+            # The cursor carries the total and offset; only rows after it are read
+            total, offset = decoded["t"], decoded["o"]
+            rows = conn.execute(
+                f"SELECT neg_popularity, id, {columns} FROM movies WHERE listing_rank >= ? AND {where} "
+                "ORDER BY listing_rank LIMIT ?",
+                [_cursor_rank(decoded), *params, limit + 1],
+            ).fetchall()
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+        else:
+            total = conn.execute(f"SELECT COUNT(*) FROM movies WHERE {where}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT neg_popularity, id, {columns} FROM movies WHERE {where} ORDER BY listing_rank LIMIT ? OFFSET ?",
+                [*params, limit, offset],
+            ).fetchall()
+            has_more = offset + limit < total
+
+    next_cursor = None
+    if has_more and rows:
+        neg_key, last_id = rows[-1][0], rows[-1][1]
+        next_cursor = data_svc.encode_cursor(neg_key, last_id, total, offset + len(rows), filter_hash)
+    items = _rows_to_movies([row[2:] for row in rows], names, columns)
+    return data_svc.FilterPage(items=items, total=total, offset=offset, next_cursor=next_cursor)
+
+
+def facets() -> Dict[str, List[str]]:
+    open_catalog()
+    result: Dict[str, List[str]] = {"genres": [], "production_companies": [], "languages": []}
+    for kind, value in _conn().execute("SELECT kind, value FROM facets ORDER BY kind, value"):
+        result[kind].append(value)
+    return result
@@ -1,14 +1,95 @@
 from __future__ import annotations
 
 from typing import List, Dict, Any, Optional, Tuple
+import base64
+import hashlib
+import json
 import os
+import threading
+from dataclasses import dataclass
+import numpy as np
 import pandas as pd
 from ast import literal_eval
 from collections.abc import Iterable
 
+from . import profiling
+from .autocomplete import SCAN_LIMIT, TOP_K, PrefixIndex
+from .query_cache import QueryCache
+
 DATA_CSV_PATH = os.path.join("data", "processed_movies.csv")
+# "pandas" (default) loads the CSV into every process; "sqlite" queries the
+# database built by the clean_movie_data pipeline (see services/catalog_db.py)
+CATALOG_BACKEND = os.environ.get("FARAGNY_CATALOG_BACKEND", "pandas").lower()
+# Written by pipelines/posters.py: source poster path -> {width: derived path}, relative to data/
+POSTER_MANIFEST_PATH = os.path.join("data", "posters", "derived", "manifest.json")
+TMDB_IMAGE_BASE = "https://image.tmdb.org/t/p"
+TMDB_POSTER_WIDTHS = (185, 342, 500)
+# Variant used for poster_url (row cards); poster_srcset lists every variant
+CARD_POSTER_WIDTH = 342
+
+# API movie field -> catalog column
+FIELD_COLUMNS = {
+    "id": "id",
+    "title": "title",
+    "overview": "overview",
+    "genres": "genres_list",
+    "production_companies": "production_companies_list",
+    "poster_url": "poster_url",
+    "poster_srcset": "poster_srcset",
+    "runtime": "runtime",
+    "original_language": "original_language",
+    "vote_average": "vote_average",
+    "vote_count": "vote_count",
+    "popularity": "popularity",
+}
+MOVIE_FIELDS = tuple(FIELD_COLUMNS)
+LIST_FIELDS = {"genres", "production_companies"}
+# Named projections; "card" is what MovieCard renders in catalog rows
+VIEWS = {
+    "card": ("id", "title", "poster_url", "poster_srcset", "vote_average"),
+    "full": MOVIE_FIELDS,
+}
+
+# Rows examined per step when resuming a filter from a cursor
+CURSOR_SCAN_CHUNK = 512
+# Bounds for the filter result cache (entries, and row ranks stored across all entries)
+FILTER_CACHE_MAX_ENTRIES = 256
+FILTER_CACHE_MAX_ROWS = 5_000_000
+# Suggestions kept per title prefix, and the match count below which a prefix is ranked on demand
+AUTOCOMPLETE_TOP_K = TOP_K
+AUTOCOMPLETE_SCAN_LIMIT = SCAN_LIMIT
+
+
+@dataclass
+class CatalogIndexes:
+    # movie id -> row position in _df
+    by_id: Dict[int, int]
+    # Sort key (negated popularity, +inf when missing) and numeric id per row position
+    neg_keys: np.ndarray
+    ids: np.ndarray
+    # Row positions in listing order: popularity descending (missing last), then id ascending
+    order: np.ndarray
+    # neg_keys / ids laid out in listing order, for binary-searching a cursor
+    order_neg_keys: np.ndarray
+    order_ids: np.ndarray
+    # Title prefix -> most popular row positions, for autocomplete
+    titles: PrefixIndex
+
+
+@dataclass
+class FilterPage:
+    items: List[Dict[str, Any]]
+    total: int
+    # Position of the first item among all matches
+    offset: int
+    next_cursor: Optional[str] = None
+
 
 _df: Optional[pd.DataFrame] = None
+_version: Optional[str] = None
+_indexes: Optional[CatalogIndexes] = None
+_load_lock = threading.Lock()
+_filter_cache = QueryCache(max_entries=FILTER_CACHE_MAX_ENTRIES, max_rows=FILTER_CACHE_MAX_ROWS)
 
 
 def _to_name_list(value) -> List[str]:
@@ -36,25 +117,58 @@ def _to_name_list(value) -> List[str]:
     return names
 
 
-def _poster_url_from_path(poster_path: str | None) -> Optional[str]:
-    if not poster_path or str(poster_path).strip() == "":
+def load_poster_manifest() -> Dict[str, Dict[int, str]]:
+    """Resized poster variants by source path ({} until pipelines/posters.py has run)."""
+    if not os.path.exists(POSTER_MANIFEST_PATH):
+        return {}
+    with open(POSTER_MANIFEST_PATH, encoding="utf-8") as fh:
+        raw = json.load(fh)
+    return {src: {int(w): path for w, path in variants.items()} for src, variants in raw.items()}
+
+
+def _static_url(path: str) -> str:
+    return f"/static/{path.replace(os.sep, '/')}"
+
+
+def _pick_variant(variants: Dict[int, str], width: int) -> str:
+    """Smallest variant at least ``width`` wide, else the largest available."""
+    fitting = [w for w in variants if w >= width]
+    return variants[min(fitting) if fitting else max(variants)]
+
+
+def poster_url_from_path(poster_path: str | None, variants: Optional[Dict[str, Dict[int, str]]] = None) -> Optional[str]:
+    """Card-sized poster URL for a catalog ``poster_path``; ``variants`` is ``load_poster_manifest()``."""
+    if not isinstance(poster_path, str) or poster_path.strip() == "":
         return None
     path = str(poster_path)
     # Remote TMDB style: /abc.jpg
     if path.startswith("/"):
-        return f"https://image.tmdb.org/t/p/w342{path}"
+        return f"{TMDB_IMAGE_BASE}/w{CARD_POSTER_WIDTH}{path}"
     # Absolute http(s)
     if path.startswith("http://") or path.startswith("https://"):
         return path
-    # Treat as local relative to data/
+    # Treat as local relative to data/, preferring a resized variant
     # Expose via /static/<relative-path>
-    return f"/static/{path.replace(os.sep, '/')}"
+    local = (variants or {}).get(path.replace(os.sep, "/"))
+    if local:
+        return _static_url(_pick_variant(local, CARD_POSTER_WIDTH))
+    return _static_url(path)
 
 
-def load_dataframe() -> pd.DataFrame:
-    global _df
-    if _df is not None:
-        return _df
+def poster_srcset_from_path(poster_path: str | None, variants: Optional[Dict[str, Dict[int, str]]] = None) -> Optional[str]:
+    """``srcset`` listing every known width of the poster (None for local posters without variants)."""
+    if not isinstance(poster_path, str) or poster_path.strip() == "":
+        return None
+    path = str(poster_path)
+    if path.startswith("/"):
+        return ", ".join(f"{TMDB_IMAGE_BASE}/w{w}{path} {w}w" for w in TMDB_POSTER_WIDTHS)
+    local = (variants or {}).get(path.replace(os.sep, "/"))
+    if not local:
+        return None
+    return ", ".join(f"{_static_url(local[w])} {w}w" for w in sorted(local))
+
+
+def _read_catalog() -> pd.DataFrame:
     usecols = [
         "id",
         "title",
@@ -80,32 +194,263 @@ def load_dataframe() -> pd.DataFrame:
     df["production_companies_list"] = (
         df.get("production_companies", "").apply(_to_name_list) if "production_companies" in df.columns else [[]]
     )
-    # Poster URL
-    df["poster_url"] = df.get("poster_path").apply(_poster_url_from_path) if "poster_path" in df.columns else None
+    # Poster URL (card-sized variant) and responsive srcset
+    if "poster_path" in df.columns:
+        variants = load_poster_manifest()
+        df["poster_url"] = df["poster_path"].apply(poster_url_from_path, variants=variants)
+        df["poster_srcset"] = df["poster_path"].apply(poster_srcset_from_path, variants=variants)
+    else:
+        df["poster_url"] = None
+        df["poster_srcset"] = None
 
     # Types
     df["id"] = df["id"].astype(int, errors="ignore")
+    return df
+
+
+def fingerprint(path: str) -> str:
+    """Cheap dataset version: changes whenever the CSV is rewritten."""
+    stat = os.stat(path)
+    raw = f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha1(raw.encode()).hexdigest()[:12]
 
-    _df = df
+
+def _build_indexes(df: pd.DataFrame) -> CatalogIndexes:
+    ids = pd.to_numeric(df["id"], errors="coerce").to_numpy(dtype=float)
+    by_id: Dict[int, int] = {}
+    for pos, mid in enumerate(ids):
+        # Keep the first row for duplicated ids, like a boolean-mask lookup would
+        if mid == mid and int(mid) not in by_id:
+            by_id[int(mid)] = pos
+
+    if "popularity" in df.columns:
+        popularity = pd.to_numeric(df["popularity"], errors="coerce").to_numpy(dtype=float)
+    else:
+        popularity = np.full(len(df), np.nan)
+    neg_keys = np.where(np.isnan(popularity), np.inf, -popularity)
+    order = np.lexsort((ids, neg_keys))
+    ranks = np.empty(len(order), dtype=np.int64)
+    ranks[order] = np.arange(len(order))
+    titles = df["title"].tolist() if "title" in df.columns else []
+    return CatalogIndexes(
+        by_id=by_id,
+        neg_keys=neg_keys,
+        ids=ids,
+        order=order,
+        order_neg_keys=neg_keys[order],
+        order_ids=ids[order],
+        titles=PrefixIndex(titles, ranks, top_k=AUTOCOMPLETE_TOP_K, scan_limit=AUTOCOMPLETE_SCAN_LIMIT),
+    )
+
+
+def load_dataframe() -> pd.DataFrame:
+    global _df, _version
+    if _df is not None:
+        return _df
+    # Requests arriving while the startup warmup is parsing the CSV wait for it instead of parsing again
+    with _load_lock:
+        if _df is None:
+            _version = fingerprint(DATA_CSV_PATH)
+            _df = _read_catalog()
     return _df
 
 
-def get_movie_by_id(movie_id: int) -> Optional[Dict[str, Any]]:
+def build_indexes() -> CatalogIndexes:
+    """Build lookup structures over the loaded catalog (idempotent)."""
+    global _indexes
+    if _indexes is not None:
+        return _indexes
     df = load_dataframe()
-    row = df.loc[df["id"] == movie_id]
-    if row.empty:
+    with _load_lock:
+        if _indexes is None:
+            _indexes = _build_indexes(df)
+    return _indexes
+
+
+def reload_dataframe() -> Optional[pd.DataFrame]:
+    """Load the CSV again and swap in the new catalog, version and indexes (sqlite: reopen the database)."""
+    global _df, _version, _indexes
+    db = _sqlite()
+    if db is not None:
+        db.reload()
+        return None
+    version = fingerprint(DATA_CSV_PATH)
+    df = _read_catalog()
+    indexes = _build_indexes(df)
+    with _load_lock:
+        _df, _version, _indexes = df, version, indexes
+    return df
+
+
+def dataset_version() -> str:
+    db = _sqlite()
+    if db is not None:
+        return db.dataset_version()
+    load_dataframe()
+    return _version
+
+
+def _sqlite():
+    """The SQLite backend module when it is selected, else None."""
+    if CATALOG_BACKEND != "sqlite":
+        return None
+    from . import catalog_db
+
+    return catalog_db
+
+
+def load_catalog() -> None:
+    """Load (pandas) or open (sqlite) the catalog; the first warmup step."""
+    db = _sqlite()
+    if db is not None:
+        db.open_catalog()
+    else:
+        load_dataframe()
+
+
+def build_catalog_indexes() -> None:
+    """Build the in-process lookup structures for the selected backend."""
+    db = _sqlite()
+    if db is not None:
+        # Nothing to build: autocomplete is precomputed in the database
+        db.open_catalog()
+    else:
+        build_indexes()
+
+
+def resolve_fields(fields: Optional[str] = None, view: Optional[str] = None) -> Optional[Tuple[str, ...]]:
+    """
+    Turn a ``fields=a,b`` list or a named view into a projection.
+
+    Returns None for "every field". ``id`` is always included. Raises
+    ValueError for unknown fields or views.
+    """
+    if fields:
+        names = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [f for f in names if f not in FIELD_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}; expected any of {', '.join(MOVIE_FIELDS)}")
+        return tuple(dict.fromkeys(["id", *names]))
+    if view:
+        if view not in VIEWS:
+            raise ValueError(f"Unknown view {view!r}; expected one of {', '.join(VIEWS)}")
+        return None if view == "full" else VIEWS[view]
+    return None
+
+
+def _movies_at(df: pd.DataFrame, positions, fields: Optional[Tuple[str, ...]] = None) -> List[Dict[str, Any]]:
+    """Materialize movie dicts for row positions, reading only the projected columns."""
+    positions = np.asarray(positions, dtype=np.int64)
+    columns: Dict[str, list] = {}
+    with profiling.stage("pandas"):
+        for field in fields or MOVIE_FIELDS:
+            column = FIELD_COLUMNS[field]
+            if column not in df.columns:
+                columns[field] = [[] if field in LIST_FIELDS else None] * len(positions)
+                continue
+            values = df[column].to_numpy()[positions].tolist()
+            # Missing values come through as NaN floats; the API reports them as null
+            columns[field] = [None if isinstance(v, float) and v != v else v for v in values]
+        if "id" in columns:
+            columns["id"] = [int(v) for v in columns["id"]]
+        names = list(columns)
+        return [dict(zip(names, row)) for row in zip(*columns.values())]
+
+
+def get_movie_by_id(movie_id: int, fields: Optional[Tuple[str, ...]] = None) -> Optional[Dict[str, Any]]:
+    db = _sqlite()
+    if db is not None:
+        return db.get_movie_by_id(movie_id, fields)
+    indexes = build_indexes()
+    pos = indexes.by_id.get(movie_id)
+    if pos is None:
         return None
-    return _row_to_movie(row.iloc[0])
+    return _movies_at(_df, [pos], fields)[0]
+
+
+def get_movies_by_ids(movie_ids: List[int], fields: Optional[Tuple[str, ...]] = None) -> List[Dict[str, Any]]:
+    """Hydrate movies in the given order in one pass; unknown and repeated ids are skipped."""
+    db = _sqlite()
+    if db is not None:
+        return db.get_movies_by_ids(movie_ids, fields)
+    indexes = build_indexes()
+    positions: List[int] = []
+    seen = set()
+    for mid in movie_ids:
+        pos = indexes.by_id.get(mid)
+        if pos is not None and pos not in seen:
+            seen.add(pos)
+            positions.append(pos)
+    return _movies_at(_df, positions, fields)
 
 
-def search_title(q: str, limit: int = 20) -> List[Dict[str, Any]]:
+def search_title(q: str, limit: int = 20, fields: Optional[Tuple[str, ...]] = None) -> List[Dict[str, Any]]:
+    db = _sqlite()
+    if db is not None:
+        return db.search_title(q, limit, fields)
     df = load_dataframe()
-    mask = df["title"].str.contains(q, case=False, na=False)
-    rows = df[mask].head(limit)
-    return [_row_to_movie(r) for _, r in rows.iterrows()]
+    with profiling.stage("pandas"):
+        mask = df["title"].str.contains(q, case=False, na=False)
+        positions = np.flatnonzero(mask.to_numpy())[:limit]
+    return _movies_at(df, positions, fields)
 
 
-def filter_movies(
+def autocomplete(prefix: str, limit: int = AUTOCOMPLETE_TOP_K, fields: Optional[Tuple[str, ...]] = None) -> List[Dict[str, Any]]:
+    """Most popular movies whose (normalized) title starts with ``prefix``."""
+    db = _sqlite()
+    if db is not None:
+        return db.autocomplete(prefix, limit, fields)
+    indexes = build_indexes()
+    return _movies_at(_df, indexes.titles.lookup(prefix, limit), fields)
+
+
+def _filter_hash(key: Tuple[Tuple[str, Any], ...]) -> str:
+    """Short id of a normalized filter spec (``_normalize_criteria``), so a cursor only continues its own query."""
+    return hashlib.sha1(json.dumps(key).encode()).hexdigest()[:12]
+
+
+def encode_cursor(neg_key: float, movie_id: float, total: int, offset: int, filter_hash: str) -> str:
+    payload = {
+        "v": dataset_version(),
+        "f": filter_hash,
+        # JSON has no infinity; movies without popularity sort last
+        "k": None if neg_key == np.inf else float(neg_key),
+        "i": int(movie_id),
+        "t": int(total),
+        "o": int(offset),
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, filter_hash: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Decode an opaque cursor; raises ValueError if it is malformed, from another
+    dataset version, or (when ``filter_hash`` is given) from another filter.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        decoded = {
+            "v": str(payload["v"]),
+            "f": str(payload["f"]),
+            "k": np.inf if payload["k"] is None else float(payload["k"]),
+            "i": int(payload["i"]),
+            "t": int(payload["t"]),
+            "o": int(payload["o"]),
+        }
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if decoded["v"] != dataset_version():
+        raise ValueError("Cursor is stale; the catalog has changed")
+    if filter_hash is not None and decoded["f"] != filter_hash:
+        # Its total and offset describe another query's matches
+        raise ValueError("Cursor belongs to a different filter")
+    return decoded
+
+
+def _filter_mask(
+    frame: pd.DataFrame,
     genres: Optional[List[str]] = None,
     production_companies: Optional[List[str]] = None,
     runtime_min: Optional[int] = None,
@@ -114,46 +459,169 @@ def filter_movies(
     vote_average_min: Optional[float] = None,
     vote_count_min: Optional[int] = None,
     popularity_min: Optional[float] = None,
-    limit: int = 20,
-    offset: int = 0,
-) -> Tuple[List[Dict[str, Any]], int]:
-    df = load_dataframe()
-    filt = pd.Series([True] * len(df), index=df.index)
+) -> np.ndarray:
+    filt = pd.Series(True, index=frame.index)
 
     if genres:
         genres_lower = {g.strip().lower() for g in genres}
-        filt &= df["genres_list"].apply(lambda lst: bool(genres_lower.intersection({x.lower() for x in lst})))
+        filt &= frame["genres_list"].apply(lambda lst: bool(genres_lower.intersection({x.lower() for x in lst})))
     if production_companies:
         companies_lower = {c.strip().lower() for c in production_companies}
-        filt &= df["production_companies_list"].apply(
+        filt &= frame["production_companies_list"].apply(
             lambda lst: bool(companies_lower.intersection({x.lower() for x in lst}))
         )
-    if runtime_min is not None and "runtime" in df.columns:
-        filt &= df["runtime"].fillna(0) >= runtime_min
-    if runtime_max is not None and "runtime" in df.columns:
-        filt &= df["runtime"].fillna(10_000) <= runtime_max
-    if language and "original_language" in df.columns:
-        filt &= df["original_language"].fillna("").str.lower() == language.lower()
-    if vote_average_min is not None and "vote_average" in df.columns:
-        filt &= df["vote_average"].fillna(0) >= vote_average_min
-    if vote_count_min is not None and "vote_count" in df.columns:
-        filt &= df["vote_count"].fillna(0) >= vote_count_min
-    if popularity_min is not None and "popularity" in df.columns:
-        filt &= df["popularity"].fillna(0) >= popularity_min
-
-    filtered = df[filt]
-    total = len(filtered)
-    
-    # Sort by popularity descending to show best movies first
-    if "popularity" in filtered.columns:
-        filtered = filtered.sort_values("popularity", ascending=False)
-    
-    page = filtered.iloc[offset : offset + limit]
-    items = [_row_to_movie(r) for _, r in page.iterrows()]
-    return items, total
+    if runtime_min is not None and "runtime" in frame.columns:
+        filt &= frame["runtime"].fillna(0) >= runtime_min
+    if runtime_max is not None and "runtime" in frame.columns:
+        filt &= frame["runtime"].fillna(10_000) <= runtime_max
+    if language and "original_language" in frame.columns:
+        filt &= frame["original_language"].fillna("").str.lower() == language.lower()
+    if vote_average_min is not None and "vote_average" in frame.columns:
+        filt &= frame["vote_average"].fillna(0) >= vote_average_min
+    if vote_count_min is not None and "vote_count" in frame.columns:
+        filt &= frame["vote_count"].fillna(0) >= vote_count_min
+    if popularity_min is not None and "popularity" in frame.columns:
+        filt &= frame["popularity"].fillna(0) >= popularity_min
+    return filt.to_numpy(dtype=bool)
+
+
+def _normalize_criteria(
+    genres: Optional[List[str]] = None,
+    production_companies: Optional[List[str]] = None,
+    runtime_min: Optional[int] = None,
+    runtime_max: Optional[int] = None,
+    language: Optional[str] = None,
+    vote_average_min: Optional[float] = None,
+    vote_count_min: Optional[int] = None,
+    popularity_min: Optional[float] = None,
+) -> Tuple[Tuple[str, Any], ...]:
+    """Canonical, hashable filter spec: equivalent filters map to the same key."""
+
+    def names(values: Optional[List[str]]) -> Optional[Tuple[str, ...]]:
+        return tuple(sorted({v.strip().lower() for v in values})) if values else None
+
+    def bound(value: Optional[float]) -> Optional[float]:
+        return None if value is None else float(value)
+
+    return (
+        ("genres", names(genres)),
+        ("production_companies", names(production_companies)),
+        ("runtime_min", bound(runtime_min)),
+        ("runtime_max", bound(runtime_max)),
+        ("language", language.lower() if language else None),
+        ("vote_average_min", bound(vote_average_min)),
+        ("vote_count_min", bound(vote_count_min)),
+        ("popularity_min", bound(popularity_min)),
+    )
+
+
+def _cursor_rank(indexes: CatalogIndexes, decoded: Dict[str, Any]) -> int:
+    """Index into the listing order of the first row after the cursor."""
+    neg_keys = indexes.order_neg_keys
+    lo = int(np.searchsorted(neg_keys, decoded["k"], side="left"))
+    hi = int(np.searchsorted(neg_keys, decoded["k"], side="right"))
+    return lo + int(np.searchsorted(indexes.order_ids[lo:hi], decoded["i"], side="right"))
+
+
+def _scan_after_cursor(
+    df: pd.DataFrame, indexes: CatalogIndexes, start: int, limit: int, criteria: Dict[str, Any]
+) -> np.ndarray:
+    """Return up to ``limit + 1`` matching positions from listing rank ``start`` on, examining only those rows."""
+    found: List[np.ndarray] = []
+    count = 0
+    chunk = max(CURSOR_SCAN_CHUNK, (limit + 1) * 4)
+    while start < len(indexes.order) and count <= limit:
+        positions = indexes.order[start : start + chunk]
+        matched = positions[_filter_mask(df.iloc[positions], **criteria)]
+        found.append(matched)
+        count += len(matched)
+        start += len(positions)
+        # Sparse filters: widen the window instead of taking many tiny steps
+        chunk *= 2
+    if not found:
+        return np.empty(0, dtype=np.int64)
+    return np.concatenate(found)[: limit + 1]
+
+
+def filter_movies(
+    genres: Optional[List[str]] = None,
+    production_companies: Optional[List[str]] = None,
+    runtime_min: Optional[int] = None,
+    runtime_max: Optional[int] = None,
+    language: Optional[str] = None,
+    vote_average_min: Optional[float] = None,
+    vote_count_min: Optional[int] = None,
+    popularity_min: Optional[float] = None,
+    limit: int = 20,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    fields: Optional[Tuple[str, ...]] = None,
+) -> FilterPage:
+    """
+    Filter the catalog, ordered by popularity (best first).
+
+    The returned page carries a cursor for the next page (None on the last
+    page). When ``cursor`` is given, ``offset`` is ignored and only rows after
+    the cursor are examined. The full match list of each filter spec is kept
+    in ``_filter_cache``, so any page of a repeated query is just a slice.
+    """
+    key = _normalize_criteria(
+        genres=genres,
+        production_companies=production_companies,
+        runtime_min=runtime_min,
+        runtime_max=runtime_max,
+        language=language,
+        vote_average_min=vote_average_min,
+        vote_count_min=vote_count_min,
+        popularity_min=popularity_min,
+    )
+    criteria = dict(key)
+    filter_hash = _filter_hash(key)
+    decoded = decode_cursor(cursor, filter_hash) if cursor else None
+    db = _sqlite()
+    if db is not None:
+        return db.filter_movies(criteria, filter_hash, limit=limit, offset=offset, decoded=decoded, fields=fields)
+
+    df = load_dataframe()
+    indexes = build_indexes()
+    ranks = _filter_cache.get(key, _version)
+
+    with profiling.stage("catalog_filter"):
+        if decoded is not None and ranks is None:
+            # Cache miss on a follow-up page: scan forward from the cursor only
+            matched = _scan_after_cursor(df, indexes, _cursor_rank(indexes, decoded), limit, criteria)
+            total, offset = decoded["t"], decoded["o"]
+            page = matched[:limit]
+            has_more = len(matched) > limit
+        else:
+            if ranks is None:
+                mask = _filter_mask(df, **criteria)
+                # Ranks (indexes into the listing order) of every match, ascending
+                ranks = np.flatnonzero(mask[indexes.order]).astype(np.int32)
+                _filter_cache.put(key, _version, ranks)
+            total = len(ranks)
+            if decoded is not None:
+                offset = int(np.searchsorted(ranks, _cursor_rank(indexes, decoded)))
+            page = indexes.order[ranks[offset : offset + limit]]
+            has_more = offset + limit < total
+
+    next_cursor = None
+    if has_more and len(page) > 0:
+        last = page[-1]
+        next_cursor = encode_cursor(indexes.neg_keys[last], indexes.ids[last], total, offset + len(page), filter_hash)
+
+    items = _movies_at(df, page, fields)
+    return FilterPage(items=items, total=total, offset=offset, next_cursor=next_cursor)
+
+
+def filter_cache_stats() -> Dict[str, Any]:
+    return _filter_cache.stats()
 
 
 def facets() -> Dict[str, List[str]]:
+    db = _sqlite()
+    if db is not None:
+        return db.facets()
     df = load_dataframe()
     all_genres = sorted({g for lst in df["genres_list"] for g in lst})
     all_companies = sorted({c for lst in df["production_companies_list"] for c in lst})
@@ -163,21 +631,3 @@ def facets() -> Dict[str, List[str]]:
         "production_companies": all_companies,
         "languages": languages,
     }
-
-
-def _row_to_movie(row: pd.Series) -> Dict[str, Any]:
-    return {
-        "id": int(row["id"]),
-        "title": row.get("title"),
-        "overview": row.get("overview"),
-        "genres": row.get("genres_list", []),
-        "production_companies": row.get("production_companies_list", []),
-        "poster_url": row.get("poster_url"),
-        "runtime": row.get("runtime"),
-        "original_language": row.get("original_language"),
-        "vote_average": row.get("vote_average"),
-        "vote_count": row.get("vote_count"),
-        "popularity": row.get("popularity"),
-    }
-
-
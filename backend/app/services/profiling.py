@@ -0,0 +1,287 @@
+"""
+Opt-in per-request profiling for production debugging.
+
+A request is profiled when it carries ``X-Profile: <FARAGNY_PROFILE_TOKEN>``
+or when it falls into the ``FARAGNY_PROFILE_SAMPLE_RATE`` fraction of
+requests. While it runs, a sampler thread records the stacks of the threads
+serving it, and ``stage()`` blocks in the services time the named stages
+(catalog filtering, pandas ops, embedding, vector query; serialization is
+measured around the endpoint). Each profile is written as JSON to
+``FARAGNY_PROFILE_DIR``; header-triggered requests also get the stage
+breakdown back in ``Server-Timing`` and the stored id in ``X-Profile-Id``.
+
+With neither setting configured the middleware and route hook are not
+installed, and ``stage()`` is a single context-variable lookup.
+``python -m benchmarks.profiles`` folds stored profiles into
+flamegraph-ready collapsed stacks.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional, Set
+import functools
+import inspect
+import json
+import logging
+import os
+import random
+import secrets
+import sys
+import threading
+import time
+import uuid
+
+from fastapi.routing import APIRoute
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile"
+PROFILE_TOKEN = os.environ.get("FARAGNY_PROFILE_TOKEN") or None
+PROFILE_SAMPLE_RATE = float(os.environ.get("FARAGNY_PROFILE_SAMPLE_RATE", "0"))
+PROFILE_DIR = os.environ.get("FARAGNY_PROFILE_DIR", os.path.join("db", "profiles"))
+PROFILE_INTERVAL_SECONDS = float(os.environ.get("FARAGNY_PROFILE_INTERVAL_MS", "2")) / 1000
+
+_active: ContextVar[Optional["Profile"]] = ContextVar("faragny_profile", default=None)
+
+
+def enabled() -> bool:
+    return PROFILE_TOKEN is not None or PROFILE_SAMPLE_RATE > 0
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}.{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class Profile:
+    """Samples and stage timings for one request."""
+
+    def __init__(self, trigger: str, interval: float = PROFILE_INTERVAL_SECONDS) -> None:
+        self.id = uuid.uuid4().hex[:16]
+        self.trigger = trigger
+        self.interval = interval
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self.samples: Dict[str, int] = {}
+        self.endpoint_done: Optional[float] = None
+        self._threads: Set[int] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample_loop, name=f"profile-{self.id}", daemon=True)
+
+    def attach(self) -> bool:
+        """Include the current thread in the samples; False if it already was."""
+        ident = threading.get_ident()
+        with self._lock:
+            if ident in self._threads:
+                return False
+            self._threads.add(ident)
+            return True
+
+    def detach(self) -> None:
+        """Stop sampling the current thread, e.g. before it returns to a shared pool."""
+        with self._lock:
+            self._threads.discard(threading.get_ident())
+
+    def add_stage(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def _sample_loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                threads = tuple(self._threads)
+            frames = sys._current_frames()
+            for ident in threads:
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                key = ";".join(reversed(stack))
+                self.samples[key] = self.samples.get(key, 0) + 1
+
+    def start(self) -> None:
+        # Threads join as they do work for the request (endpoint, stages), so the
+        # event loop idling between requests does not swamp the samples
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._sampler.join()
+
+
+class _NoStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_STAGE = _NoStage()
+
+
+@contextmanager
+def _timed_stage(profile: Profile, name: str) -> Iterator[None]:
+    attached = profile.attach()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_stage(name, time.perf_counter() - started)
+        if attached:
+            profile.detach()
+
+
+def stage(name: str):
+    """
+    Time a block as ``name`` in the active profile; a no-op when the request is not profiled.
+
+    Stages should not nest: time outside every stage is reported as "other".
+    """
+    profile = _active.get()
+    if profile is None:
+        return _NO_STAGE
+    return _timed_stage(profile, name)
+
+
+def _timed_endpoint(call: Callable[..., Any]) -> Callable[..., Any]:
+    """Mark when the endpoint returns, so the rest of the request counts as serialization."""
+    if inspect.iscoroutinefunction(call):
+
+        @functools.wraps(call)
+        async def async_wrapper(*args, **kwargs):
+            profile = _active.get()
+            if profile is None:
+                return await call(*args, **kwargs)
+            # The event loop thread stays attached until the response is serialized
+            profile.attach()
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                profile.endpoint_done = time.perf_counter()
+
+        return async_wrapper
+
+    @functools.wraps(call)
+    def wrapper(*args, **kwargs):
+        profile = _active.get()
+        if profile is None:
+            return call(*args, **kwargs)
+        attached = profile.attach()
+        try:
+            return call(*args, **kwargs)
+        finally:
+            profile.endpoint_done = time.perf_counter()
+            if attached:
+                profile.detach()
+
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """APIRoute whose endpoint records when it returns (see ``route_class``)."""
+
+    def get_route_handler(self):
+        self.dependant.call = _timed_endpoint(self.dependant.call)
+        return super().get_route_handler()
+
+
+def route_class() -> type:
+    """Route class for routers: the timing hook only when profiling is configured."""
+    return ProfiledRoute if enabled() else APIRoute
+
+
+def _trigger(scope) -> Optional[str]:
+    if PROFILE_TOKEN is not None:
+        for key, value in scope.get("headers") or ():
+            if key == PROFILE_HEADER.encode():
+                # Compare raw bytes: header values are client-controlled and may
+                # hold non-ASCII bytes, which are simply "not profiled"
+                if secrets.compare_digest(value, PROFILE_TOKEN.encode()):
+                    return "header"
+                break
+    if PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE:
+        return "sampled"
+    return None
+
+
+def _store(record: Dict[str, Any]) -> None:
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    name = time.strftime("%Y%m%dT%H%M%S", time.gmtime()) + f"-{record['id']}.json"
+    tmp = os.path.join(PROFILE_DIR, name + ".tmp")
+    with open(tmp, "w") as fh:
+        json.dump(record, fh)
+    os.replace(tmp, os.path.join(PROFILE_DIR, name))
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware that profiles authorized or sampled API requests."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith("/static/"):
+            await self.app(scope, receive, send)
+            return
+        trigger = _trigger(scope)
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile = Profile(trigger)
+        token = _active.set(profile)
+        status = {"code": None, "response_start": None}
+
+        def breakdown(until: float) -> Dict[str, float]:
+            stages = dict(profile.stages)
+            if profile.endpoint_done is not None:
+                stages["serialization"] = max(until - profile.endpoint_done, 0.0)
+            total = until - profile.started
+            stages["other"] = max(total - sum(stages.values()), 0.0)
+            stages["total"] = total
+            return {name: round(seconds * 1000, 3) for name, seconds in stages.items()}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                status["response_start"] = time.perf_counter()
+                if trigger == "header":
+                    timing = ", ".join(f"{name};dur={ms}" for name, ms in breakdown(status["response_start"]).items())
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [
+                        (b"server-timing", timing.encode()),
+                        (b"x-profile-id", profile.id.encode()),
+                    ]
+            await send(message)
+
+        profile.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _active.reset(token)
+            profile.stop()
+            record = {
+                "id": profile.id,
+                "trigger": trigger,
+                "method": scope["method"],
+                "path": scope["path"],
+                "query": scope.get("query_string", b"").decode("latin-1"),
+                "status": status["code"],
+                "interval_ms": profile.interval * 1000,
+                "stages_ms": breakdown(status["response_start"] or time.perf_counter()),
+                "samples": profile.samples,
+            }
+            try:
+                _store(record)
+            except OSError:
+                logger.exception("Could not store profile %s", profile.id)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+import threading
+
+import numpy as np
+
+
+class QueryCache:
+    """
+    Thread-safe LRU of query results (arrays of row ranks) tied to a dataset version.
+
+    Bounded both by entry count and by the total number of stored row ranks,
+    so a few very broad queries cannot pin a large share of memory. The whole
+    cache is dropped the first time it is used with a new dataset version.
+    """
+
+    def __init__(self, max_entries: int = 256, max_rows: int = 5_000_000) -> None:
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self._entries: "OrderedDict[Hashable, np.ndarray]" = OrderedDict()
+        self._rows = 0
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _check_version(self, version: str) -> None:
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._rows = 0
+            self._version = version
+
+    def get(self, key: Hashable, version: str) -> Optional[np.ndarray]:
+        with self._lock:
+            self._check_version(version)
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, version: str, value: np.ndarray) -> None:
+        if len(value) > self.max_rows:
+            return
+        with self._lock:
+            self._check_version(version)
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._rows -= len(previous)
+            self._entries[key] = value
+            self._rows += len(value)
+            while len(self._entries) > self.max_entries or self._rows > self.max_rows:
+                _, evicted = self._entries.popitem(last=False)
+                self._rows -= len(evicted)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._rows = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "rows": self._rows,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "version": self._version,
+            }
@@ -0,0 +1,138 @@
+"""
+Per-user taste vectors: the mean stored embedding of the movies in a watchlist.
+
+The mean is updated in O(dim) whenever a movie is added to or removed from a
+watchlist, so building the "For you" row costs a single vector query.
+Each mean records the vector store version it was built against and is
+rebuilt from the whole watchlist once the store changes (re-embedded
+catalog, movies that gained an embedding), since incremental updates are
+only valid against the vectors that were folded in. Updates are
+compare-and-swap writes, and the row records how many watchlist entries it
+covers, so concurrent watchlist changes cause a rebuild instead of a lost
+update.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import List, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from ..database import UserTasteVector
+from . import vector as vector_svc
+
+
+def _pack(values) -> bytes:
+    return array("f", values).tobytes()
+
+
+def _unpack(blob: Optional[bytes]) -> array:
+    vec = array("f")
+    if blob:
+        vec.frombytes(blob)
+    return vec
+
+
+def _embedding(movie_id: int) -> Optional[List[float]]:
+    return vector_svc.get_embeddings([movie_id]).get(movie_id)
+
+
+def rebuild(db: Session, user_id: int, movie_ids: List[int]) -> UserTasteVector:
+    """Recompute a user's taste vector from scratch (used to backfill existing watchlists)."""
+    row = db.get(UserTasteVector, user_id) or UserTasteVector(user_id=user_id)
+    row.store_version = vector_svc.store_version()
+    row.watchlist_size = len(movie_ids)
+    embeddings = list(vector_svc.get_embeddings(movie_ids).values())
+    row.count = len(embeddings)
+    if embeddings:
+        dim = len(embeddings[0])
+        row.vector = _pack(sum(e[i] for e in embeddings) / len(embeddings) for i in range(dim))
+    else:
+        row.vector = None
+    db.add(row)
+    return row
+
+
+def _drop(db: Session, user_id: int) -> None:
+    """Forget a user's mean; the next read rebuilds it from the whole watchlist."""
+    db.execute(delete(UserTasteVector).where(UserTasteVector.user_id == user_id))
+
+
+def _apply(db: Session, user_id: int, movie_id: int, sign: int) -> None:
+    # Read and write with plain statements: the update below must compare against exactly what was read
+    row = db.execute(
+        select(
+            UserTasteVector.count,
+            UserTasteVector.vector,
+            UserTasteVector.watchlist_size,
+            UserTasteVector.store_version,
+        ).where(UserTasteVector.user_id == user_id)
+    ).first()
+    if row is None:
+        # Never built for this user; the first read backfills it from the whole watchlist
+        return
+    try:
+        stale = row.store_version != vector_svc.store_version()
+        embedding = None if stale else _embedding(movie_id)
+    except Exception:
+        # Vector store unavailable: drop the row so it is rebuilt on the next read
+        _drop(db, user_id)
+        return
+    if stale:
+        # Built against other vectors: subtracting this movie's current one would corrupt the mean
+        _drop(db, user_id)
+        return
+
+    vector, n = row.vector, row.count or 0
+    if embedding is not None:
+        mean = _unpack(row.vector)
+        if n and len(mean) != len(embedding):
+            # Embedding model changed since the vector was built
+            _drop(db, user_id)
+            return
+        if sign > 0:
+            mean = mean if n else [0.0] * len(embedding)
+            vector, n = _pack((m * n + e) / (n + 1) for m, e in zip(mean, embedding)), n + 1
+        elif n <= 1:
+            vector, n = None, 0
+        else:
+            vector, n = _pack((m * n - e) / (n - 1) for m, e in zip(mean, embedding)), n - 1
+
+    # Compare-and-swap: a concurrent watchlist change for this user already wrote the row,
+    # and folding this movie into a mean we did not read would lose that change
+    swapped = db.execute(
+        update(UserTasteVector)
+        .where(
+            UserTasteVector.user_id == user_id,
+            UserTasteVector.count == row.count,
+            UserTasteVector.vector.is_not_distinct_from(row.vector),
+            UserTasteVector.watchlist_size == row.watchlist_size,
+        )
+        .values(count=n, vector=vector, watchlist_size=row.watchlist_size + sign)
+        .execution_options(synchronize_session=False)
+    )
+    if swapped.rowcount != 1:
+        _drop(db, user_id)
+
+
+def on_added(db: Session, user_id: int, movie_id: int) -> None:
+    """Fold a newly saved movie into the mean. Call before committing the watchlist change."""
+    _apply(db, user_id, movie_id, +1)
+
+
+def on_removed(db: Session, user_id: int, movie_id: int) -> None:
+    """Take a removed movie out of the mean. Call before committing the watchlist change."""
+    _apply(db, user_id, movie_id, -1)
+
+
+def get_taste_vector(db: Session, user_id: int, movie_ids: List[int]) -> Optional[List[float]]:
+    row = db.get(UserTasteVector, user_id)
+    # A watchlist change that raced a rebuild is missing from the mean: the sizes disagree
+    if row is None or row.store_version != vector_svc.store_version() or row.watchlist_size != len(movie_ids):
+        row = rebuild(db, user_id, movie_ids)
+        db.commit()
+    if not row.count:
+        return None
+    return list(_unpack(row.vector))
@@ -1,18 +1,158 @@
 from typing import List, Dict, Any
-from langchain_chroma import Chroma
-from langchain_ollama import OllamaEmbeddings
+import os
+import threading
 
-PERSIST_DIR = "db/chroma_store"
+from . import profiling
+from .admission import AdmissionLimiter
+from .vector_layout import COLLECTION_NAME, PERSIST_DIR, STORE_VERSION_FILE
 
-_embeddings = OllamaEmbeddings(model="nomic-embed-text")
-_db = Chroma(persist_directory=PERSIST_DIR, embedding_function=_embeddings)
+EMBEDDING_MODEL = "nomic-embed-text"
+
+# Embedding-backed searches: at most this many Ollama round-trips at once, a short
+# waiting line beyond that, and a deadline after which callers get a fast failure
+SEARCH_MAX_CONCURRENCY = int(os.environ.get("FARAGNY_SEARCH_MAX_CONCURRENCY", "4"))
+SEARCH_MAX_QUEUE = int(os.environ.get("FARAGNY_SEARCH_MAX_QUEUE", "16"))
+SEARCH_TIMEOUT_SECONDS = float(os.environ.get("FARAGNY_SEARCH_TIMEOUT_SECONDS", "5"))
+
+_search_limiter = AdmissionLimiter(
+    "semantic-search",
+    max_concurrency=SEARCH_MAX_CONCURRENCY,
+    max_queue=SEARCH_MAX_QUEUE,
+    timeout=SEARCH_TIMEOUT_SECONDS,
+)
+
+# Built on first use (or by the startup warmup) so importing this module stays cheap
+_embeddings = None
+_db = None
+# Version of the opened store ("" when unknown, e.g. a store built before versioning)
+_store_version = ""
+_lock = threading.Lock()
+
+
+def configure(embeddings=None, store=None) -> None:
+    """Override the embedder and/or vector store, e.g. with a local fake for benchmarks."""
+    global _embeddings, _db, _store_version
+    with _lock:
+        if embeddings is not None:
+            _embeddings = embeddings
+            _db = None
+        if store is not None:
+            _db = store
+            _store_version = ""
+
+
+def get_store():
+    global _embeddings, _db, _store_version
+    if _db is not None:
+        return _db
+    with _lock:
+        if _db is None:
+            from langchain_chroma import Chroma
+
+            if _embeddings is None:
+                from langchain_ollama import OllamaEmbeddings
+
+                _embeddings = OllamaEmbeddings(model=EMBEDDING_MODEL)
+            _db = Chroma(
+                collection_name=COLLECTION_NAME,
+                persist_directory=PERSIST_DIR,
+                embedding_function=_embeddings,
+            )
+            version_file = os.path.join(PERSIST_DIR, STORE_VERSION_FILE)
+            if os.path.exists(version_file):
+                with open(version_file, encoding="utf-8") as fh:
+                    _store_version = fh.read().strip()
+    return _db
+
+
+def store_version() -> str:
+    """Identifies the contents of the opened store; vectors derived from it are stale once it changes."""
+    get_store()
+    return _store_version
+
+
+def warm() -> int:
+    """Open the vector store and touch its collection; returns the document count."""
+    return get_store()._collection.count()
+
+
+def _similarity_search(text: str, k: int):
+    store = get_store()
+    if store.embeddings is None:
+        return store.similarity_search(text, k=k)
+    # Same as similarity_search, split so profiles can tell embedding and query time apart
+    with profiling.stage("embedding"):
+        embedding = store.embeddings.embed_query(text)
+    with profiling.stage("vector_query"):
+        return store.similarity_search_by_vector(embedding, k=k)
 
 
 def search_similar(text: str, k: int = 10):
-    return _db.similarity_search(text, k=k)
+    """Embed ``text`` and query the store; raises admission.Saturated when overloaded."""
+    return _search_limiter.run(_similarity_search, text, k)
 
 
-def get_raw(limit: int = 5) -> Dict[str, Any]:
-    return _db.get(limit=limit)
+def _batch_search_ids(texts: List[str], k: int) -> List[List[int]]:
+    store = get_store()
+    if store.embeddings is None:
+        # As in similarity_search without an embedder: the collection embeds the texts itself
+        with profiling.stage("vector_query"):
+            result = store._collection.query(query_texts=texts, n_results=k, include=["metadatas"])
+    else:
+        with profiling.stage("embedding"):
+            embeddings = store.embeddings.embed_documents(texts)
+        with profiling.stage("vector_query"):
+            result = store._collection.query(query_embeddings=embeddings, n_results=k, include=["metadatas"])
+    ids: List[List[int]] = []
+    for metadatas in result.get("metadatas") or []:
+        row = []
+        for meta in metadatas:
+            mid = (meta or {}).get("movie_id")
+            if isinstance(mid, (int, float)) and mid == mid:  # not NaN
+                row.append(int(mid))
+        ids.append(row)
+    return ids
+
+
+def search_similar_ids_batch(texts: List[str], k: int = 10) -> List[List[int]]:
+    """
+    Movie ids of the ``k`` nearest documents for each text, in input order.
+
+    All texts are embedded in one call and looked up in one multi-query
+    search, taking a single admission slot; raises admission.Saturated when
+    overloaded.
+    """
+    if not texts:
+        return []
+    return _search_limiter.run(_batch_search_ids, texts, k)
+
 
+def admission_stats() -> Dict[str, Any]:
+    return _search_limiter.stats()
 
+
+def get_embeddings(movie_ids: List[int]) -> Dict[int, List[float]]:
+    """Stored embeddings keyed by movie id; ids missing from the store are omitted."""
+    if not movie_ids:
+        return {}
+    with profiling.stage("vector_query"):
+        result = get_store().get(where={"movie_id": {"$in": list(movie_ids)}}, include=["embeddings", "metadatas"])
+    vectors = result.get("embeddings")
+    embeddings: Dict[int, List[float]] = {}
+    # Chroma may hand back a numpy array here, so avoid truth-testing it
+    for meta, embedding in zip(result.get("metadatas") or [], vectors if vectors is not None else []):
+        mid = (meta or {}).get("movie_id")
+        if isinstance(mid, (int, float)) and mid == mid and int(mid) not in embeddings:
+            embeddings[int(mid)] = [float(v) for v in embedding]
+    return embeddings
+
+
+def search_by_vector(embedding: List[float], k: int = 10, exclude_ids: List[int] = ()):
+    """Nearest neighbours of a precomputed embedding, skipping ``exclude_ids``."""
+    where = {"movie_id": {"$nin": list(exclude_ids)}} if exclude_ids else None
+    with profiling.stage("vector_query"):
+        return get_store().similarity_search_by_vector(embedding, k=k, filter=where)
+
+
+def get_raw(limit: int = 5) -> Dict[str, Any]:
+    return get_store().get(limit=limit)
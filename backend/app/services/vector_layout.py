@@ -0,0 +1,13 @@
+"""
+Where the movie vector store lives, shared by the API (``app.services.vector``)
+and the pipeline that builds it (``pipelines.update_vectors``).
+
+Kept free of imports so the pipeline can load it from the repository root
+without pulling in the API.
+"""
+
+# Relative to the working directory: backend/ for the API, the repo root for pipelines
+PERSIST_DIR = "db/chroma_store"
+COLLECTION_NAME = "movies"
+# Written by pipelines.update_vectors.merge_shards; changes whenever the store is rebuilt
+STORE_VERSION_FILE = "store_version"
@@ -0,0 +1,62 @@
+"""
+Background warmup of the catalog, its indexes and the vector store.
+
+The app starts serving immediately; ``/readyz`` reports ready only once every
+step below has completed so deploys can wait for a warm instance.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+import threading
+import time
+
+from . import data as data_svc
+from . import vector as vector_svc
+
+logger = logging.getLogger(__name__)
+
+STEPS: List[Tuple[str, Callable[[], Any]]] = [
+    ("catalog", data_svc.load_catalog),
+    ("indexes", data_svc.build_catalog_indexes),
+    ("vector_store", vector_svc.warm),
+]
+
+_lock = threading.Lock()
+_thread: Optional[threading.Thread] = None
+_state: Dict[str, Any] = {"status": "pending", "steps": {}, "error": None}
+
+
+def _run() -> None:
+    _state["status"] = "warming"
+    for name, step in STEPS:
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception as exc:  # surfaced through /readyz rather than crashing the worker
+            logger.exception("Warmup step %s failed", name)
+            _state["steps"][name] = {"ok": False, "seconds": round(time.perf_counter() - started, 3)}
+            _state["error"] = f"{name}: {exc}"
+            _state["status"] = "failed"
+            return
+        _state["steps"][name] = {"ok": True, "seconds": round(time.perf_counter() - started, 3)}
+    _state["status"] = "ready"
+
+
+def start() -> threading.Thread:
+    """Start warming in a daemon thread (no-op if already started)."""
+    global _thread
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_run, name="faragny-warmup", daemon=True)
+            _thread.start()
+        return _thread
+
+
+def is_ready() -> bool:
+    return _state["status"] == "ready"
+
+
+def status() -> Dict[str, Any]:
+    return {"status": _state["status"], "steps": dict(_state["steps"]), "error": _state["error"]}
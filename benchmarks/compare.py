@@ -0,0 +1,64 @@
+"""
+Compare two benchmark result files produced by ``benchmarks.run``.
+
+Usage:
+    python -m benchmarks.compare baseline.json candidate.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+Key = Tuple[int, str, str]
+
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "throughput_rps")
+
+
+def _index(path: Path) -> Dict[Key, Dict[str, Any]]:
+    report = json.loads(path.read_text())
+    return {(r["catalog_rows"], r["scenario"], r["mode"]): r for r in report["results"]}
+
+
+def _ratio(old: Optional[float], new: Optional[float]) -> str:
+    if not old or new is None:
+        return "n/a"
+    return f"{new / old:.2f}x"
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    args = parser.parse_args(argv)
+
+    old = _index(args.baseline)
+    new = _index(args.candidate)
+
+    header = f"{'rows':>9}  {'scenario':<26} {'mode':<10}" + "".join(f"{m:>22}" for m in METRICS)
+    print("Values are from the candidate run; ratios are candidate / baseline.")
+    print(header)
+    print("-" * len(header))
+    for key in sorted(old.keys() & new.keys()):
+        rows, scenario, mode = key
+        cells = []
+        for metric in METRICS:
+            if metric not in old[key]:
+                # catalog.load rows only carry a duration
+                metric = "seconds"
+            before, after = old[key].get(metric), new[key].get(metric)
+            value = f"{after:.2f}" if isinstance(after, (int, float)) else "n/a"
+            cells.append(f"{value} ({_ratio(before, after)})".rjust(22))
+            if metric == "seconds":
+                break
+        print(f"{rows:>9,}  {scenario:<26} {mode:<10}" + "".join(cells))
+
+    for label, missing in (("baseline", new.keys() - old.keys()), ("candidate", old.keys() - new.keys())):
+        for rows, scenario, mode in sorted(missing):
+            print(f"not in {label}: {rows:,} {scenario} {mode}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Check that the SQLite catalog backend returns the same results as the pandas one.
+
+Builds a synthetic catalog with the awkward cases real data has (missing
+popularity, runtime and language, popularity ties, duplicated ids, mixed-case
+and accented titles) and checks it twice: once written straight to the
+processed CSV and the SQLite catalog, and once as a raw Kaggle-style dataset
+run through ``clean_movies_dataset`` (Kaggle genre dicts, TMDB, local and
+missing posters, a poster variant manifest). Each time, randomized lookups,
+title searches, filters (offset and cursor pages), facets and autocomplete
+run against both backends and the API-level results are compared. Exits
+non-zero on any mismatch.
+
+Usage (from the repository root):
+    python -m benchmarks.parity --rows 20000 --queries 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+from ast import literal_eval
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_WORKDIR = REPO_ROOT / "benchmarks" / ".workspace" / "parity"
+
+for _path in (REPO_ROOT, REPO_ROOT / "backend"):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+from benchmarks.synthetic import COMPANIES, GENRES, LANGUAGES, WORDS, generate_catalog  # noqa: E402
+from pipelines.catalog_db import build_catalog_db  # noqa: E402
+from pipelines.clean_data import clean_movies_dataset  # noqa: E402
+
+
+def _awkward_catalog(rows: int, seed: int):
+    df = generate_catalog(rows, seed)
+    rng = np.random.default_rng(seed + 1)
+    pick = lambda share: rng.random(len(df)) < share  # noqa: E731
+    df.loc[pick(0.03), "popularity"] = np.nan
+    df.loc[pick(0.03), "runtime"] = np.nan
+    df.loc[pick(0.02), "original_language"] = np.nan
+    df.loc[pick(0.02), "vote_count"] = np.nan
+    # Coarse popularity so many rows tie on the sort key
+    df["popularity"] = df["popularity"].round(0)
+    titles = df["title"].to_numpy(dtype=object)
+    for i in np.flatnonzero(pick(0.05)):
+        titles[i] = f"The {titles[i].upper()}"
+    for i in np.flatnonzero(pick(0.01)):
+        titles[i] = titles[i] + " Café"
+    df["title"] = titles
+    # A few rows reuse an existing id: lookups must resolve to the first one
+    dupes = df.sample(n=max(1, rows // 500), random_state=seed).copy()
+    dupes["id"] = df["id"].sample(n=len(dupes), random_state=seed + 2).to_numpy()
+    return df._append(dupes, ignore_index=True) if hasattr(df, "_append") else df.append(dupes, ignore_index=True)
+
+
+def _raw_dataset(rows: int, seed: int) -> pd.DataFrame:
+    """The awkward catalog in the shape of the raw Kaggle CSV the pipeline cleans."""
+    df = _awkward_catalog(rows, seed)
+    for column in ("genres", "production_companies"):
+        df[column] = [repr([{"id": i, "name": name} for i, name in enumerate(literal_eval(v))]) for v in df[column]]
+    # TMDB paths, local files (some with resized variants) and missing posters
+    df["poster_path"] = [
+        f"/p{i}.jpg" if i % 3 == 0 else f"posters/p{i}.jpg" if i % 3 == 1 else None for i in range(len(df))
+    ]
+    return df
+
+
+def _write_poster_manifest(rows: int) -> None:
+    manifest = {
+        f"posters/p{i}.jpg": {str(w): f"posters/derived/h{i}-w{w}.webp" for w in (185, 342, 500)}
+        for i in range(1, rows, 6)
+    }
+    Path("data/posters/derived").mkdir(parents=True, exist_ok=True)
+    Path("data/posters/derived/manifest.json").write_text(json.dumps(manifest))
+
+
+def _normalize(result: Any) -> Any:
+    """Compare what the API would serialize: Movie models, cursors without their version."""
+    from app.models import Movie
+    from app.services import data as data_svc
+
+    if result is None:
+        return None
+    if isinstance(result, data_svc.FilterPage):
+        cursor = data_svc.decode_cursor(result.next_cursor) if result.next_cursor else None
+        if cursor:
+            cursor.pop("v")
+        return {"items": _normalize(result.items), "total": result.total, "offset": result.offset, "cursor": cursor}
+    if isinstance(result, list):
+        return [Movie(**m).model_dump(exclude_unset=True) if isinstance(m, dict) else m for m in result]
+    if isinstance(result, dict) and "id" in result:
+        return Movie(**result).model_dump(exclude_unset=True)
+    return result
+
+
+def _both(call: Callable[[], Any]) -> Dict[str, Any]:
+    from app.services import data as data_svc
+
+    out = {}
+    for backend in ("pandas", "sqlite"):
+        data_svc.CATALOG_BACKEND = backend
+        out[backend] = _normalize(call())
+    return out
+
+
+def _random_criteria(rng: random.Random) -> Dict[str, Any]:
+    criteria: Dict[str, Any] = {}
+    if rng.random() < 0.5:
+        criteria["genres"] = [rng.choice(GENRES).lower() if rng.random() < 0.3 else rng.choice(GENRES) for _ in range(rng.randint(1, 2))]
+    if rng.random() < 0.2:
+        criteria["production_companies"] = [rng.choice(COMPANIES)]
+    if rng.random() < 0.3:
+        criteria["runtime_min"] = rng.choice([0, 80, 100, 120])
+    if rng.random() < 0.2:
+        criteria["runtime_max"] = rng.choice([90, 110, 150])
+    if rng.random() < 0.3:
+        criteria["language"] = rng.choice(LANGUAGES).upper() if rng.random() < 0.3 else rng.choice(LANGUAGES)
+    if rng.random() < 0.3:
+        criteria["vote_average_min"] = rng.choice([5.0, 6.5, 7.5])
+    if rng.random() < 0.2:
+        criteria["vote_count_min"] = rng.choice([10, 100, 1000])
+    if rng.random() < 0.2:
+        criteria["popularity_min"] = rng.choice([1, 10, 50])
+    return criteria
+
+
+def _check(catalog: pd.DataFrame, queries: int, seed: int) -> int:
+    """Run randomized cases against both backends; returns the number of mismatches."""
+    from app.services import catalog_db
+    from app.services import data as data_svc
+
+    data_svc.CATALOG_BACKEND = "pandas"
+    data_svc.reload_dataframe()
+    catalog_db.reload()
+
+    rng = random.Random(seed)
+    ids = catalog["id"].astype(int).tolist()
+    titles = catalog["title"].tolist()
+    cases: Dict[str, List[Callable[[], Any]]] = {
+        "facets": [data_svc.facets],
+        "get_movie_by_id": [],
+        "get_movies_by_ids": [],
+        "search_title": [],
+        "filter_movies": [],
+        "filter_movies.cursor": [],
+        "autocomplete": [],
+    }
+    for _ in range(queries):
+        mid = rng.choice(ids) if rng.random() < 0.9 else -rng.randint(1, 1000)
+        fields = rng.choice([None, data_svc.VIEWS["card"], ("id", "genres", "runtime", "original_language")])
+        cases["get_movie_by_id"].append(lambda mid=mid, f=fields: data_svc.get_movie_by_id(mid, f))
+        batch = rng.sample(ids, 20) + [-1, rng.choice(ids)]
+        cases["get_movies_by_ids"].append(lambda b=batch, f=fields: data_svc.get_movies_by_ids(b, f))
+
+        title = rng.choice(titles)
+        start = rng.randrange(len(title))
+        q = rng.choice([rng.choice(WORDS), title[start : start + rng.randint(1, 8)], rng.choice(WORDS)[:2].upper()])
+        if q.isalnum() or " " in q:
+            cases["search_title"].append(lambda q=q, f=fields: data_svc.search_title(q, 20, f))
+        cases["autocomplete"].append(lambda p=title[: rng.randint(1, 10)], f=fields: data_svc.autocomplete(p, 10, f))
+
+        criteria = _random_criteria(rng)
+        limit = rng.choice([1, 20, 40])
+        offset = rng.choice([0, 0, 40, 400])
+        cases["filter_movies"].append(lambda c=criteria, l=limit, o=offset: data_svc.filter_movies(**c, limit=l, offset=o))
+
+        def cursor_chain(c=criteria, l=limit):
+            # Follow each backend's own cursors for a few pages
+            pages, cursor = [], None
+            for _ in range(4):
+                page = data_svc.filter_movies(**c, limit=l, cursor=cursor)
+                pages.append(_normalize(page))
+                cursor = page.next_cursor
+                if cursor is None:
+                    break
+            return tuple(pages)
+
+        cases["filter_movies.cursor"].append(cursor_chain)
+
+    failures = 0
+    for name, calls in cases.items():
+        mismatched = 0
+        for call in calls:
+            result = _both(call)
+            if result["pandas"] != result["sqlite"]:
+                mismatched += 1
+                if mismatched == 1:
+                    print(f"    first {name} mismatch:\n    pandas: {str(result['pandas'])[:400]}\n    sqlite: {str(result['sqlite'])[:400]}")
+        failures += mismatched
+        print(f"  {name:<22} {len(calls) - mismatched:>5}/{len(calls)} match")
+    data_svc.CATALOG_BACKEND = "pandas"
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=300, help="Random cases per function")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", type=Path, default=DEFAULT_WORKDIR)
+    args = parser.parse_args(argv)
+
+    # The backend resolves data/ and db/ relative to the working directory
+    workdir = args.workdir.resolve()
+    (workdir / "data").mkdir(parents=True, exist_ok=True)
+    os.chdir(workdir)
+    _write_poster_manifest(args.rows)
+
+    print("processed catalog:")
+    catalog = _awkward_catalog(args.rows, args.seed)
+    catalog.to_csv("data/processed_movies.csv", index=False)
+    print(f"  {build_catalog_db('data/processed_movies.csv', 'db/catalog.db')}")
+    failures = _check(catalog, args.queries, args.seed)
+
+    print("cleaned by the pipeline:")
+    _raw_dataset(args.rows, args.seed).to_csv("data/data.csv", index=False)
+    clean_movies_dataset("data/data.csv", "data/processed_movies.csv", "db/catalog.db")
+    failures += _check(pd.read_csv("data/processed_movies.csv"), args.queries, args.seed + 1)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
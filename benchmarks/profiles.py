@@ -0,0 +1,76 @@
+"""
+Aggregate request profiles stored by the API (``FARAGNY_PROFILE_DIR``).
+
+Writes the summed samples as collapsed stacks ("frame;frame;frame count"),
+the input format of flamegraph.pl, inferno and speedscope, and prints the
+mean per-stage breakdown to stderr.
+
+Usage:
+    python -m benchmarks.profiles backend/db/profiles > movies.folded
+    python -m benchmarks.profiles backend/db/profiles --path /movies/filter --min-total-ms 200
+    flamegraph.pl movies.folded > movies.svg
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def _load(directory: Path, path: Optional[str], min_total_ms: float) -> Iterable[Dict[str, Any]]:
+    for file in sorted(directory.glob("*.json")):
+        try:
+            record = json.loads(file.read_text())
+        except (OSError, ValueError):
+            continue
+        if path and record.get("path") != path:
+            continue
+        if record.get("stages_ms", {}).get("total", 0.0) < min_total_ms:
+            continue
+        yield record
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", type=Path, help="Directory of stored profiles")
+    parser.add_argument("--path", help="Only profiles of this request path, e.g. /movies/filter")
+    parser.add_argument("--min-total-ms", type=float, default=0.0, help="Only requests at least this slow")
+    parser.add_argument("--by-path", action="store_true", help="Prefix every stack with the request path")
+    parser.add_argument("--output", type=Path, help="Write collapsed stacks here instead of stdout")
+    args = parser.parse_args(argv)
+
+    stacks: Counter = Counter()
+    stages: Dict[str, float] = defaultdict(float)
+    count = 0
+    for record in _load(args.directory, args.path, args.min_total_ms):
+        count += 1
+        for stack, samples in record.get("samples", {}).items():
+            key = f"{record['method']} {record['path']};{stack}" if args.by_path else stack
+            stacks[key] += samples
+        for name, ms in record.get("stages_ms", {}).items():
+            stages[name] += ms
+
+    lines = [f"{stack} {samples}" for stack, samples in sorted(stacks.items())]
+    if args.output:
+        args.output.write_text("\n".join(lines) + "\n" if lines else "")
+    else:
+        for line in lines:
+            print(line)
+
+    print(f"{count} profiles, {sum(stacks.values())} samples", file=sys.stderr)
+    if count:
+        total = stages.get("total", 0.0) / count
+        for name, ms in sorted(stages.items(), key=lambda item: -item[1]):
+            if name == "total":
+                continue
+            share = f"{ms / count / total:6.1%}" if total else "   n/a"
+            print(f"  {name:<16}{ms / count:10.2f} ms  {share}", file=sys.stderr)
+        print(f"  {'total':<16}{total:10.2f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
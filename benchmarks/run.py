@@ -0,0 +1,345 @@
+"""
+Benchmark the movie and watchlist APIs against synthetic catalogs.
+
+Every endpoint in ``routers/movies.py`` and ``routers/watchlist.py`` is driven
+in-process through FastAPI's TestClient, first sequentially and then from a
+pool of concurrent clients. Ollama is replaced by ``HashEmbeddings`` so runs
+are reproducible and offline.
+
+Usage (from the repository root):
+    python -m benchmarks.run --sizes 10k 100k 1m
+    python -m benchmarks.compare old.json new.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_WORKDIR = REPO_ROOT / "benchmarks" / ".workspace"
+DEFAULT_RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+
+for _path in (REPO_ROOT, REPO_ROOT / "backend"):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+from benchmarks.synthetic import GENRES, WORDS, write_catalog  # noqa: E402
+from pipelines.embeddings import HashEmbeddings  # noqa: E402
+
+# (method, url, params, json body)
+Call = Tuple[str, str, Optional[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+
+@dataclass
+class Scenario:
+    name: str
+    make_call: Callable[[random.Random], Call]
+
+
+def parse_size(value: str) -> int:
+    value = value.strip().lower()
+    multiplier = 1
+    if value.endswith("k"):
+        multiplier, value = 1_000, value[:-1]
+    elif value.endswith("m"):
+        multiplier, value = 1_000_000, value[:-1]
+    return int(float(value) * multiplier)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def _words(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def build_scenarios(rows: int, watchlist_pool: List[int], added: List[int]) -> List[Scenario]:
+    def movie_id(rng: random.Random) -> int:
+        return rng.randint(1, rows)
+
+    def add_call(rng: random.Random) -> Call:
+        mid = watchlist_pool.pop()
+        added.append(mid)
+        return ("POST", f"/watchlist/{mid}", None, None)
+
+    def remove_call(rng: random.Random) -> Call:
+        return ("DELETE", f"/watchlist/{added.pop()}", None, None)
+
+    return [
+        Scenario("movies.get", lambda rng: ("GET", f"/movies/{movie_id(rng)}", None, None)),
+        Scenario(
+            "movies.search.title",
+            lambda rng: ("GET", "/movies/search", {"q": rng.choice(WORDS), "mode": "title", "limit": 30}, None),
+        ),
+        Scenario(
+            "movies.search.auto_miss",
+            # Titles never contain digits, so auto mode always falls through to semantic search
+            lambda rng: ("GET", "/movies/search", {"q": f"{_words(rng, 3)} 42", "mode": "auto", "limit": 30}, None),
+        ),
+        Scenario(
+            "movies.search.semantic",
+            lambda rng: ("GET", "/movies/search", {"q": _words(rng, 6), "mode": "semantic", "limit": 30}, None),
+        ),
+        Scenario(
+            "movies.autocomplete",
+            lambda rng: ("GET", "/movies/autocomplete", {"prefix": _words(rng, 1)[: rng.randint(1, 6)], "limit": 8}, None),
+        ),
+        Scenario("movies.filter.none", lambda rng: ("GET", "/movies/filter", {"limit": 40}, None)),
+        Scenario(
+            "movies.filter.genre",
+            lambda rng: ("GET", "/movies/filter", {"genres": [rng.choice(GENRES)], "limit": 40}, None),
+        ),
+        Scenario(
+            "movies.filter.card_view",
+            lambda rng: ("GET", "/movies/filter", {"genres": [rng.choice(GENRES)], "limit": 40, "view": "card"}, None),
+        ),
+        Scenario(
+            "movies.filter.combined",
+            lambda rng: (
+                "GET",
+                "/movies/filter",
+                {
+                    "genres": rng.sample(GENRES, 2),
+                    "runtime_min": 80,
+                    "runtime_max": 150,
+                    "vote_average_min": 6.0,
+                    "vote_count_min": 10,
+                    "language": "en",
+                    "limit": 40,
+                },
+                None,
+            ),
+        ),
+        Scenario(
+            "movies.filter.deep_page",
+            lambda rng: (
+                "GET",
+                "/movies/filter",
+                {"genres": [rng.choice(GENRES)], "limit": 40, "offset": rng.randint(1, 50) * 40},
+                None,
+            ),
+        ),
+        Scenario("movies.facets", lambda rng: ("GET", "/movies/facets", None, None)),
+        Scenario(
+            "movies.similar_text",
+            lambda rng: (
+                "POST",
+                "/movies/similar-text",
+                None,
+                {"overview": _words(rng, 20), "genres": [rng.choice(GENRES)], "k": 12},
+            ),
+        ),
+        Scenario(
+            "movies.similar_text.batch",
+            lambda rng: (
+                "POST",
+                "/movies/similar-text/batch",
+                None,
+                {
+                    "queries": [
+                        {"overview": _words(rng, 20), "genres": [rng.choice(GENRES)], "k": 12} for _ in range(6)
+                    ]
+                },
+            ),
+        ),
+        Scenario("movies.similar", lambda rng: ("GET", f"/movies/{movie_id(rng)}/similar", {"k": 12}, None)),
+        Scenario("movies.for_you", lambda rng: ("GET", "/movies/for-you", {"k": 20}, None)),
+        Scenario("watchlist.get", lambda rng: ("GET", "/watchlist", None, None)),
+        Scenario("watchlist.ids", lambda rng: ("GET", "/watchlist/ids", None, None)),
+        Scenario("watchlist.add", add_call),
+        Scenario("watchlist.remove", remove_call),
+    ]
+
+
+def build_vector_store(rows: int, vector_rows: int, seed: int, dimensions: int):
+    """Index the first ``vector_rows`` movies of the catalog into a fresh Chroma collection."""
+    import pandas as pd
+    from langchain_chroma import Chroma
+
+    persist_dir = Path("db") / f"bench_chroma_{rows}_{seed}_{vector_rows}_{dimensions}"
+    embeddings = HashEmbeddings(dimensions=dimensions)
+    store = Chroma(
+        collection_name="benchmark",
+        persist_directory=str(persist_dir),
+        embedding_function=embeddings,
+    )
+    if store._collection.count() == min(rows, vector_rows):
+        return store
+
+    # Drop a partial collection left by an interrupted run
+    store.delete_collection()
+    store = Chroma(
+        collection_name="benchmark",
+        persist_directory=str(persist_dir),
+        embedding_function=embeddings,
+    )
+    df = pd.read_csv("data/processed_movies.csv", nrows=vector_rows, usecols=["id", "title", "overview"])
+    batch = 1_000
+    for start in range(0, len(df), batch):
+        chunk = df.iloc[start : start + batch]
+        store.add_texts(
+            texts=[f"{t}\nOverview: {o if isinstance(o, str) else ''}" for t, o in zip(chunk["title"], chunk["overview"])],
+            metadatas=[{"movie_id": int(mid), "title": str(t)} for mid, t in zip(chunk["id"], chunk["title"])],
+            ids=[str(mid) for mid in chunk["id"]],
+        )
+    return store
+
+
+def _run_calls(client, headers, scenario: Scenario, count: int, concurrency: int, seed: int) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    calls = [scenario.make_call(rng) for _ in range(count)]
+
+    def one(call: Call) -> Tuple[float, bool]:
+        method, url, params, body = call
+        started = time.perf_counter()
+        response = client.request(method, url, params=params, json=body, headers=headers)
+        return (time.perf_counter() - started) * 1000, response.status_code < 400
+
+    wall_start = time.perf_counter()
+    if concurrency <= 1:
+        outcomes = [one(call) for call in calls]
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            outcomes = list(pool.map(one, calls))
+    wall = time.perf_counter() - wall_start
+
+    latencies = sorted(ms for ms, _ in outcomes)
+    return {
+        "requests": count,
+        "errors": sum(1 for _, ok in outcomes if not ok),
+        "mean_ms": round(statistics.fmean(latencies), 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+        "throughput_rps": round(count / wall, 2) if wall > 0 else 0.0,
+    }
+
+
+def bench_catalog(rows: int, args: argparse.Namespace) -> List[Dict[str, Any]]:
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+    from app.services import data as data_svc
+    from app.services import vector as vector_svc
+
+    catalog_start = time.perf_counter()
+    write_catalog(Path("data/processed_movies.csv"), rows, seed=args.seed)
+    generate_s = time.perf_counter() - catalog_start
+
+    vector_start = time.perf_counter()
+    vector_svc.configure(store=build_vector_store(rows, args.vector_rows, args.seed, args.dimensions))
+    vector_s = time.perf_counter() - vector_start
+
+    load_start = time.perf_counter()
+    data_svc.reload_dataframe()
+    load_s = time.perf_counter() - load_start
+    print(f"[{rows:>9,} rows] catalog {generate_s:.1f}s, vectors {vector_s:.1f}s, load {load_s:.2f}s", flush=True)
+
+    results: List[Dict[str, Any]] = [
+        {"catalog_rows": rows, "scenario": "catalog.load", "mode": "cold", "seconds": round(load_s, 3)}
+    ]
+
+    # Server errors are counted per scenario instead of aborting the run
+    with TestClient(app, raise_server_exceptions=False) as client:
+        username = f"bench_{rows}_{int(time.time())}"
+        client.post("/auth/register", json={"username": username, "password": "bench"})
+        token = client.post("/auth/login", json={"username": username, "password": "bench"}).json()["token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        # Seed a realistic watchlist; the add/remove scenarios use ids outside this range
+        for mid in range(1, min(rows, args.watchlist_size) + 1):
+            client.post(f"/watchlist/{mid}", headers=headers)
+
+        needed = (args.warmup + args.requests) * 2
+        pool_ids = list(range(rows, max(rows - needed, args.watchlist_size), -1))
+        added: List[int] = []
+        for scenario in build_scenarios(rows, pool_ids, added):
+            if args.only and not any(scenario.name.startswith(p) for p in args.only):
+                continue
+            _run_calls(client, headers, scenario, args.warmup, 1, args.seed + 1)
+            for mode, concurrency in (("sequential", 1), ("concurrent", args.concurrency)):
+                stats = _run_calls(client, headers, scenario, args.requests, concurrency, args.seed)
+                results.append(
+                    {"catalog_rows": rows, "scenario": scenario.name, "mode": mode, "concurrency": concurrency, **stats}
+                )
+                print(
+                    f"  {scenario.name:<26} {mode:<10} p50 {stats['p50_ms']:>9.2f}ms  "
+                    f"p95 {stats['p95_ms']:>9.2f}ms  p99 {stats['p99_ms']:>9.2f}ms  "
+                    f"{stats['throughput_rps']:>8.1f} req/s  errors {stats['errors']}",
+                    flush=True,
+                )
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: Optional[List[str]] = None) -> Path:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", default=["10k", "100k", "1m"], help="Catalog sizes, e.g. 10k 1m")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per scenario and mode")
+    parser.add_argument("--warmup", type=int, default=5, help="Unmeasured requests before each scenario")
+    parser.add_argument("--concurrency", type=int, default=16, help="Client threads for the concurrent mode")
+    parser.add_argument("--vector-rows", type=int, default=20_000, help="Movies indexed into the vector store")
+    parser.add_argument("--dimensions", type=int, default=64, help="Fake embedding dimensions")
+    parser.add_argument("--watchlist-size", type=int, default=25, help="Movies pre-seeded into the watchlist")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="*", help="Only run scenarios whose name starts with one of these")
+    parser.add_argument("--workdir", type=Path, default=DEFAULT_WORKDIR, help="Scratch directory for data/ and db/")
+    parser.add_argument("--output", type=Path, help="Results JSON path (default: benchmarks/results/<timestamp>.json)")
+    args = parser.parse_args(argv)
+
+    started = datetime.now(timezone.utc)
+    output = (args.output or DEFAULT_RESULTS_DIR / f"bench-{started:%Y%m%dT%H%M%SZ}.json").resolve()
+
+    # The backend resolves data/ and db/ relative to the working directory
+    workdir = args.workdir.resolve()
+    (workdir / "data").mkdir(parents=True, exist_ok=True)
+    (workdir / "db").mkdir(parents=True, exist_ok=True)
+    os.chdir(workdir)
+
+    results: List[Dict[str, Any]] = []
+    for size in args.sizes:
+        results.extend(bench_catalog(parse_size(size), args))
+
+    report = {
+        "started_at": started.isoformat(),
+        "git_commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "args": {k: (str(v) if isinstance(v, Path) else v) for k, v in vars(args).items()},
+        "results": results,
+    }
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Wrote {output}")
+    return output
+
+
+if __name__ == "__main__":
+    main()
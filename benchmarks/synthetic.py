@@ -0,0 +1,111 @@
+"""
+Deterministic synthetic catalogs in the processed_movies.csv format.
+
+The generated file has the columns and list encoding that
+``app.services.data.load_dataframe`` reads, so the backend loads it through
+its normal code path.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+GENRES = [
+    "Action",
+    "Adventure",
+    "Animation",
+    "Comedy",
+    "Crime",
+    "Documentary",
+    "Drama",
+    "Family",
+    "Fantasy",
+    "History",
+    "Horror",
+    "Music",
+    "Mystery",
+    "Romance",
+    "Science Fiction",
+    "TV Movie",
+    "Thriller",
+    "War",
+    "Western",
+]
+
+COMPANIES = [f"Studio {i:03d}" for i in range(400)]
+
+LANGUAGES = ["en", "en", "en", "en", "fr", "es", "de", "ja", "ko", "it", "hi", "ar"]
+
+WORDS = (
+    "love war space dark night city girl boy secret lost last first king queen "
+    "dead life world star house river road blood fire ice dream ghost shadow "
+    "heart home mission escape return rise fall storm island summer winter "
+    "killer family friend stranger journey legend empire hunter machine time"
+).split()
+
+
+def _pick_names(rng: np.random.Generator, pool: list[str], rows: int, max_items: int) -> list[str]:
+    counts = rng.integers(0, max_items + 1, size=rows)
+    picks = rng.integers(0, len(pool), size=(rows, max_items))
+    out = []
+    for count, row in zip(counts, picks):
+        # dict.fromkeys dedupes while keeping the pick order stable
+        names = list(dict.fromkeys(pool[i] for i in row[:count]))
+        out.append(repr(names))
+    return out
+
+
+def _sentences(rng: np.random.Generator, rows: int, min_words: int, max_words: int) -> list[str]:
+    lengths = rng.integers(min_words, max_words + 1, size=rows)
+    picks = rng.integers(0, len(WORDS), size=(rows, max_words))
+    return [" ".join(WORDS[i] for i in row[:n]) for n, row in zip(lengths, picks)]
+
+
+def generate_catalog(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Build a synthetic catalog with ``rows`` movies."""
+    rng = np.random.default_rng(seed)
+
+    titles = [s.title() for s in _sentences(rng, rows, 1, 4)]
+    overviews = _sentences(rng, rows, 12, 40)
+    runtime = rng.normal(105, 20, size=rows).clip(40, 240).round()
+    # Popularity is heavy-tailed like the real TMDB data
+    popularity = np.round(rng.pareto(1.5, size=rows) * 5, 3)
+    vote_count = rng.poisson(popularity * 40)
+    vote_average = np.round(rng.normal(6.3, 1.1, size=rows).clip(0, 10), 1)
+
+    df = pd.DataFrame(
+        {
+            "id": np.arange(1, rows + 1),
+            "title": titles,
+            "overview": overviews,
+            "genres": _pick_names(rng, GENRES, rows, 3),
+            "production_companies": _pick_names(rng, COMPANIES, rows, 2),
+            "poster_path": [f"/p{i}.jpg" for i in range(1, rows + 1)],
+            "runtime": runtime,
+            "original_language": rng.choice(LANGUAGES, size=rows),
+            "vote_average": vote_average,
+            "vote_count": vote_count,
+            "popularity": popularity,
+        }
+    )
+
+    return df
+
+
+def write_catalog(path: str | Path, rows: int, seed: int = 0) -> Path:
+    """Write a synthetic catalog to ``path``, reusing an existing file for the same size and seed."""
+    path = Path(path)
+    marker = path.with_suffix(".seed")
+    stamp = f"{rows}:{seed}"
+    if path.exists() and marker.exists() and marker.read_text() == stamp:
+        return path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    generate_catalog(rows, seed).to_csv(path, index=False)
+    marker.write_text(stamp)
+    return path
+
+
+__all__ = ["generate_catalog", "write_catalog", "GENRES", "COMPANIES", "WORDS"]
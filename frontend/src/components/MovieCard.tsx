@@ -18,6 +18,8 @@ export default function MovieCard({ movie, onClick, size = "normal" }: Props) {
       {poster ? (
         <img
           src={poster}
+          srcSet={movie.poster_srcset || undefined}
+          sizes={size === "small" ? "140px" : "(max-width: 768px) 140px, 200px"}
           alt={movie.title}
           className="movie-card-poster"
           loading="lazy"
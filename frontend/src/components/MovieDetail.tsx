@@ -17,18 +17,30 @@ export default function MovieDetail({
   watchlistIds,
   onWatchlistChange 
 }: Props) {
+  const [details, setDetails] = useState<any | null>(null);
   const [similar, setSimilar] = useState<any[]>([]);
   const [loadingSimilar, setLoadingSimilar] = useState(false);
   const [addingToList, setAddingToList] = useState(false);
 
   const isInWatchlist = movie ? watchlistIds.includes(movie.id) : false;
 
+  // Rows only carry the card fields; load the full record for the modal
+  useEffect(() => {
+    if (movie?.id) {
+      setDetails(null);
+      api
+        .get(`/movies/${movie.id}`)
+        .then(({ data }) => setDetails(data))
+        .catch(() => {});
+    }
+  }, [movie?.id]);
+
   useEffect(() => {
     if (movie?.id) {
       setSimilar([]);
       setLoadingSimilar(true);
       api
-        .get(`/movies/${movie.id}/similar`, { params: { k: 12 } })
+        .get(`/movies/${movie.id}/similar`, { params: { k: 12, view: "card" } })
         .then(({ data }) => {
           setSimilar(data.items || []);
         })
@@ -65,14 +77,21 @@ export default function MovieDetail({
 
   if (!movie) return null;
 
-  const rating = movie.vote_average ? movie.vote_average.toFixed(1) : null;
-  const year = movie.release_date
-    ? new Date(movie.release_date).getFullYear()
+  const info = details && details.id === movie.id ? details : movie;
+
+  const rating = info.vote_average ? info.vote_average.toFixed(1) : null;
+  const year = info.release_date
+    ? new Date(info.release_date).getFullYear()
+    : null;
+  const runtime = info.runtime ? `${info.runtime} min` : null;
+  // The detail view is wide: use the largest poster variant from the srcset
+  const largestPoster = info.poster_srcset
+    ? info.poster_srcset.split(",").pop().trim().split(" ")[0]
     : null;
-  const runtime = movie.runtime ? `${movie.runtime} min` : null;
   const backdropUrl =
-    movie.backdrop_url ||
-    movie.poster_url ||
+    info.backdrop_url ||
+    largestPoster ||
+    info.poster_url ||
     "";
 
   return (
@@ -89,11 +108,11 @@ export default function MovieDetail({
             ✕
           </button>
           <div className="modal-hero-content">
-            <h2 className="modal-title">{movie.title}</h2>
+            <h2 className="modal-title">{info.title}</h2>
             <div className="modal-actions">
               <button 
                 className="modal-btn primary"
-                onClick={() => window.open(`https://www.google.com/search?q=Where+to+watch+${encodeURIComponent(movie.title)}`, '_blank')}
+                onClick={() => window.open(`https://www.google.com/search?q=Where+to+watch+${encodeURIComponent(info.title)}`, '_blank')}
               >
                 ▶ Where to Watch
               </button>
@@ -122,36 +141,36 @@ export default function MovieDetail({
           </div>
 
           <p className="modal-overview">
-            {movie.overview || "No overview available."}
+            {info.overview || "No overview available."}
           </p>
 
           <div className="modal-details">
             <div className="modal-detail-item">
               <div className="modal-detail-label">Genres</div>
               <div className="modal-detail-value">
-                {Array.isArray(movie.genres)
-                  ? movie.genres.join(", ")
-                  : movie.genres || "—"}
+                {Array.isArray(info.genres)
+                  ? info.genres.join(", ")
+                  : info.genres || "—"}
               </div>
             </div>
             <div className="modal-detail-item">
               <div className="modal-detail-label">Production</div>
               <div className="modal-detail-value">
-                {Array.isArray(movie.production_companies)
-                  ? movie.production_companies.slice(0, 3).join(", ")
-                  : movie.production_companies || "—"}
+                {Array.isArray(info.production_companies)
+                  ? info.production_companies.slice(0, 3).join(", ")
+                  : info.production_companies || "—"}
               </div>
             </div>
             <div className="modal-detail-item">
               <div className="modal-detail-label">Language</div>
               <div className="modal-detail-value">
-                {movie.original_language?.toUpperCase() || "—"}
+                {info.original_language?.toUpperCase() || "—"}
               </div>
             </div>
             <div className="modal-detail-item">
               <div className="modal-detail-label">Popularity</div>
               <div className="modal-detail-value">
-                {movie.popularity ? movie.popularity.toFixed(0) : "—"}
+                {info.popularity ? info.popularity.toFixed(0) : "—"}
               </div>
             </div>
           </div>
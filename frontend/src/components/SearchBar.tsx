@@ -1,3 +1,6 @@
+import { useEffect, useState } from "react";
+import { api } from "../api";
+
 type SearchMode = "auto" | "title" | "semantic";
 
 type Props = {
@@ -6,15 +9,48 @@ type Props = {
   mode: SearchMode;
   setMode: (m: SearchMode) => void;
   onSearch: () => void;
+  onSelectSuggestion: (movie: any) => void;
 };
 
-export default function SearchBar({ q, setQ, mode, setMode, onSearch }: Props) {
+export default function SearchBar({ q, setQ, mode, setMode, onSearch, onSelectSuggestion }: Props) {
+  const [suggestions, setSuggestions] = useState<any[]>([]);
+
+  // Title suggestions come from the prefix index, so every keystroke is cheap
+  useEffect(() => {
+    const prefix = q.trim();
+    if (!prefix || mode === "semantic") {
+      setSuggestions([]);
+      return;
+    }
+    let cancelled = false;
+    const timer = setTimeout(() => {
+      api
+        .get("/movies/autocomplete", { params: { prefix: q, limit: 8, view: "card" } })
+        .then(({ data }) => {
+          if (!cancelled) setSuggestions(data.items || []);
+        })
+        .catch(() => {});
+    }, 80);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [q, mode]);
+
   function handleKeyDown(e: React.KeyboardEvent) {
     if (e.key === "Enter") {
+      setSuggestions([]);
       onSearch();
+    } else if (e.key === "Escape") {
+      setSuggestions([]);
     }
   }
 
+  function handlePick(movie: any) {
+    setSuggestions([]);
+    onSelectSuggestion(movie);
+  }
+
   return (
     <div className="search-container">
       <input
@@ -24,7 +60,17 @@ export default function SearchBar({ q, setQ, mode, setMode, onSearch }: Props) {
         value={q}
         onChange={(e) => setQ(e.target.value)}
         onKeyDown={handleKeyDown}
+        onBlur={() => setTimeout(() => setSuggestions([]), 150)}
       />
+      {suggestions.length > 0 && (
+        <ul className="search-suggestions">
+          {suggestions.map((m) => (
+            <li key={m.id} onMouseDown={() => handlePick(m)}>
+              {m.title}
+            </li>
+          ))}
+        </ul>
+      )}
       <div className="search-mode">
         {(["auto", "title", "semantic"] as SearchMode[]).map((m) => (
           <button
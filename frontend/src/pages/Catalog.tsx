@@ -33,6 +33,7 @@ export default function Catalog() {
   const [scrolled, setScrolled] = useState(false);
   const [watchlist, setWatchlist] = useState<any[]>([]);
   const [watchlistIds, setWatchlistIds] = useState<number[]>([]);
+  const [forYou, setForYou] = useState<any[]>([]);
 
   const auth = getAuth();
 
@@ -48,7 +49,7 @@ export default function Catalog() {
   // Fetch watchlist
   const fetchWatchlist = useCallback(async () => {
     try {
-      const { data } = await api.get("/watchlist");
+      const { data } = await api.get("/watchlist", { params: { view: "card" } });
       setWatchlist(data.items || []);
       setWatchlistIds((data.items || []).map((m: any) => m.id));
     } catch (err) {
@@ -63,13 +64,27 @@ export default function Catalog() {
     fetchWatchlist();
   }, [fetchWatchlist]);
 
+  // Personalized row follows the watchlist
+  useEffect(() => {
+    if (watchlistIds.length === 0) {
+      setForYou([]);
+      return;
+    }
+    api
+      .get("/movies/for-you", { params: { k: 20, view: "card" } })
+      .then(({ data }) => setForYou(data.items || []))
+      .catch(() => setForYou([]));
+  }, [watchlistIds]);
+
   // Load initial genre rows with deduplication
   useEffect(() => {
     async function loadRows() {
       const rawResults = await Promise.all(
         GENRE_ROWS.map(async (row) => {
           try {
-            const { data } = await api.get("/movies/filter", { params: row.params });
+            const { data } = await api.get("/movies/filter", {
+              params: { ...row.params, view: "card" },
+            });
             return { title: row.title, movies: data.items || [] };
           } catch {
             return { title: row.title, movies: [] };
@@ -94,7 +109,13 @@ export default function Catalog() {
       const trending = deduped.find((r) => r.title === "Trending Now");
       if (trending && trending.movies.length > 0) {
         const randomIndex = Math.floor(Math.random() * Math.min(5, trending.movies.length));
-        setHeroMovie(trending.movies[randomIndex]);
+        const pick = trending.movies[randomIndex];
+        setHeroMovie(pick);
+        // The hero shows genres and the overview, which card rows leave out
+        api
+          .get(`/movies/${pick.id}`)
+          .then(({ data }) => setHeroMovie(data))
+          .catch(() => {});
       }
     }
     loadRows();
@@ -108,7 +129,7 @@ export default function Catalog() {
     setLoading(true);
     try {
       const { data } = await api.get("/movies/search", {
-        params: { q, mode, limit: 30 },
+        params: { q, mode, limit: 30, view: "card" },
       });
       setSearchResults(data.items || []);
     } finally {
@@ -135,6 +156,7 @@ export default function Catalog() {
             mode={mode}
             setMode={setMode}
             onSearch={runSearch}
+            onSelectSuggestion={handleSelectMovie}
           />
           <div className="navbar-user">
             <div className="avatar">{auth.username?.[0]?.toUpperCase() || "U"}</div>
@@ -243,6 +265,13 @@ export default function Catalog() {
                   onSelect={handleSelectMovie}
                 />
               )}
+              {index === topRatedIndex && forYou.length > 0 && (
+                <MovieRow
+                  title="For You"
+                  movies={forYou}
+                  onSelect={handleSelectMovie}
+                />
+              )}
             </div>
           ))}
       </div>
@@ -0,0 +1,239 @@
+"""
+Build the SQLite catalog the API can serve from instead of the in-memory DataFrame.
+
+The database is derived from the processed CSV and is always rebuilt whole
+into a temporary file, then swapped in, so readers never see a partial
+catalog. Layout:
+
+* ``movies``: one row per CSV row; ``pos`` (the rowid) is the CSV row
+  position and ``listing_rank`` the position in the API's listing order
+  (popularity descending, missing last, then id). A covering index on
+  ``listing_rank`` plus the filter columns serves filtered pages without
+  touching the table.
+* ``movie_genres`` / ``movie_companies``: one row per (movie, name), indexed
+  both ways, with a lowercased ``name_key`` for case-insensitive filters.
+* ``titles_fts``: FTS5 trigram index over titles for substring search.
+* ``facets``: the distinct genres, companies and languages.
+* ``title_keys`` / ``title_prefixes``: autocomplete. Every normalized title
+  (and its form without a leading article) with the row's listing rank, plus
+  the precomputed top-k rows of each prefix matching more than
+  ``AUTOCOMPLETE_SCAN_LIMIT`` keys, so a lookup is one primary-key read or a
+  short range scan. Keys and top-k lists come from the API's own
+  ``app.services.autocomplete``, so both backends give the same answers
+  (``benchmarks.parity`` checks it).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from backend.app.services import autocomplete
+
+CATALOG_DB_PATH = Path("db") / "catalog.db"
+SCHEMA_VERSION = 2
+INSERT_BATCH_SIZE = 10_000
+AUTOCOMPLETE_TOP_K = autocomplete.TOP_K
+AUTOCOMPLETE_SCAN_LIMIT = autocomplete.SCAN_LIMIT
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE movies (
+    pos INTEGER PRIMARY KEY,
+    id INTEGER NOT NULL,
+    title TEXT,
+    overview TEXT,
+    genres TEXT NOT NULL,
+    production_companies TEXT NOT NULL,
+    poster_path TEXT,
+    runtime REAL,
+    original_language TEXT,
+    language_key TEXT NOT NULL,
+    vote_average REAL,
+    vote_count REAL,
+    popularity REAL,
+    neg_popularity REAL NOT NULL,
+    listing_rank INTEGER NOT NULL
+);
+CREATE TABLE movie_genres (pos INTEGER NOT NULL, name TEXT NOT NULL, name_key TEXT NOT NULL);
+CREATE TABLE movie_companies (pos INTEGER NOT NULL, name TEXT NOT NULL, name_key TEXT NOT NULL);
+CREATE TABLE facets (kind TEXT NOT NULL, value TEXT NOT NULL, PRIMARY KEY (kind, value)) WITHOUT ROWID;
+CREATE TABLE title_keys (
+    key TEXT NOT NULL,
+    pos INTEGER NOT NULL,
+    listing_rank INTEGER NOT NULL,
+    PRIMARY KEY (key, pos)
+) WITHOUT ROWID;
+CREATE TABLE title_prefixes (prefix TEXT PRIMARY KEY, positions TEXT NOT NULL) WITHOUT ROWID;
+CREATE VIRTUAL TABLE titles_fts USING fts5(title, content='movies', content_rowid='pos', tokenize='trigram');
+"""
+
+_INDEXES = """
+CREATE UNIQUE INDEX movies_listing ON movies (
+    listing_rank, language_key, runtime, vote_average, vote_count, popularity
+);
+CREATE INDEX movies_sort_key ON movies (neg_popularity, id, listing_rank);
+CREATE INDEX movies_id ON movies (id);
+CREATE INDEX movie_genres_by_movie ON movie_genres (pos, name_key);
+CREATE INDEX movie_genres_by_name ON movie_genres (name_key, pos);
+CREATE INDEX movie_companies_by_movie ON movie_companies (pos, name_key);
+CREATE INDEX movie_companies_by_name ON movie_companies (name_key, pos);
+INSERT INTO titles_fts (titles_fts) VALUES ('rebuild');
+ANALYZE;
+"""
+
+
+def _value(value):
+    """SQLite-friendly scalar: NaN becomes NULL, numpy scalars become Python ones."""
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def build_catalog_db(
+    processed_path: str | Path | None = None,
+    db_path: str | Path | None = None,
+) -> dict:
+    """
+    Build the catalog database from the processed CSV.
+
+    Returns:
+        Stage summary (database path, row count, duration).
+    """
+
+    # Imported here: clean_data calls this module at the end of a clean
+    from pipelines.clean_data import PROCESSED_DATA_PATH, _to_name_list
+
+    started = time.perf_counter()
+    source = Path(processed_path) if processed_path else PROCESSED_DATA_PATH
+    target = Path(db_path) if db_path else CATALOG_DB_PATH
+    if not source.exists():
+        raise FileNotFoundError(f"Processed dataset not found at {source}")
+
+    df = pd.read_csv(source)
+    # Same listing order as the in-memory catalog: popularity desc (missing last), id asc, then file order
+    ids = pd.to_numeric(df["id"], errors="coerce").to_numpy(dtype=float)
+    if "popularity" in df.columns:
+        popularity = pd.to_numeric(df["popularity"], errors="coerce").to_numpy(dtype=float)
+    else:
+        popularity = np.full(len(df), np.nan)
+    neg_keys = np.where(np.isnan(popularity), np.inf, -popularity)
+    ranks = np.empty(len(df), dtype=np.int64)
+    ranks[np.lexsort((ids, neg_keys))] = np.arange(len(df))
+
+    def column(name: str):
+        return df[name].tolist() if name in df.columns else [None] * len(df)
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(target.name + ".tmp")
+    if tmp.exists():
+        tmp.unlink()
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.executescript("PRAGMA journal_mode = OFF; PRAGMA synchronous = OFF;" + _SCHEMA)
+        genres_all, companies_all, languages = set(), set(), set()
+        rows, genre_rows, company_rows = [], [], []
+
+        def flush() -> None:
+            conn.executemany("INSERT INTO movies VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.executemany("INSERT INTO movie_genres VALUES (?, ?, ?)", genre_rows)
+            conn.executemany("INSERT INTO movie_companies VALUES (?, ?, ?)", company_rows)
+            rows.clear()
+            genre_rows.clear()
+            company_rows.clear()
+
+        columns = zip(
+            column("id"),
+            column("title"),
+            column("overview"),
+            column("genres"),
+            column("production_companies"),
+            # poster_url is already formatted; the API derives it (and the srcset) from poster_path
+            column("poster_path"),
+            column("runtime"),
+            column("original_language"),
+            column("vote_average"),
+            column("vote_count"),
+            column("popularity"),
+        )
+        for pos, (mid, title, overview, genres, companies, poster, runtime, language, vote_avg, vote_cnt, pop) in enumerate(columns):
+            genres, companies = _to_name_list(genres), _to_name_list(companies)
+            language = _value(language)
+            genres_all.update(genres)
+            companies_all.update(companies)
+            if language is not None:
+                languages.add(str(language).lower())
+            rows.append(
+                (
+                    pos,
+                    int(mid),
+                    _value(title),
+                    _value(overview),
+                    json.dumps(genres),
+                    json.dumps(companies),
+                    _value(poster),
+                    _value(runtime),
+                    language,
+                    "" if language is None else str(language).lower(),
+                    _value(vote_avg),
+                    _value(vote_cnt),
+                    _value(pop),
+                    float(neg_keys[pos]),
+                    int(ranks[pos]),
+                )
+            )
+            genre_rows.extend((pos, name, name.lower()) for name in genres)
+            company_rows.extend((pos, name, name.lower()) for name in companies)
+            if len(rows) >= INSERT_BATCH_SIZE:
+                flush()
+        flush()
+
+        title_keys = autocomplete.index_keys(column("title"))
+        keys = [key for key, _ in title_keys]
+        key_positions = np.array([pos for _, pos in title_keys], dtype=np.int64)
+        key_ranks = ranks[key_positions]
+        conn.executemany(
+            "INSERT INTO title_keys VALUES (?, ?, ?)",
+            zip(keys, key_positions.tolist(), key_ranks.tolist()),
+        )
+        tops = autocomplete.prefix_tops(
+            keys, key_positions, key_ranks, top_k=AUTOCOMPLETE_TOP_K, scan_limit=AUTOCOMPLETE_SCAN_LIMIT
+        )
+        conn.executemany(
+            "INSERT INTO title_prefixes VALUES (?, ?)",
+            ((prefix, json.dumps(top.tolist())) for prefix, top in tops),
+        )
+
+        conn.executemany(
+            "INSERT INTO facets VALUES (?, ?)",
+            [("genres", v) for v in genres_all]
+            + [("production_companies", v) for v in companies_all]
+            + [("languages", v) for v in languages],
+        )
+        conn.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [
+                ("schema_version", str(SCHEMA_VERSION)),
+                ("rows", str(len(df))),
+                ("source", str(source)),
+                ("autocomplete_top_k", str(AUTOCOMPLETE_TOP_K)),
+            ],
+        )
+        conn.commit()
+        conn.executescript(_INDEXES)
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp, target)
+    return {"db_path": str(target), "rows": int(len(df)), "seconds": round(time.perf_counter() - started, 3)}
+
+
+__all__ = ["build_catalog_db", "CATALOG_DB_PATH", "SCHEMA_VERSION"]
@@ -7,6 +7,8 @@ run in automated contexts such as Airflow.
 
 from __future__ import annotations
 
+import os
+import time
 from pathlib import Path
 from ast import literal_eval
 from collections.abc import Iterable
@@ -14,6 +16,9 @@ from typing import Iterable as TypingIterable
 
 import pandas as pd
 
+from pipelines.catalog_db import CATALOG_DB_PATH, build_catalog_db
+from pipelines.manifest import file_fingerprint, load_manifest, update_manifest
+
 DATA_DIR = Path("data")
 RAW_DATA_PATH = DATA_DIR / "data.csv"
 PROCESSED_DATA_PATH = DATA_DIR / "processed_movies.csv"
@@ -52,26 +57,29 @@ def _to_name_list(value) -> list[str]:
 
 
 def _poster_url_from_path(poster_path: str | None) -> str | None:
-    if not poster_path or str(poster_path).strip() == "":
+    if not isinstance(poster_path, str) or poster_path.strip() == "":
         return None
-    path = str(poster_path)
+    path = poster_path
     if path.startswith("/"):
         return f"https://image.tmdb.org/t/p/w342{path}"
     if path.startswith("http://") or path.startswith("https://"):
         return path
-    return f"/static/{path.replace(Path.sep, '/')}"
+    return f"/static/{path.replace(os.sep, '/')}"
 
 
 def clean_movies_dataset(
     raw_source: str | Path | None = None,
     output_path: str | Path | None = None,
+    db_path: str | Path | None = None,
 ) -> Path:
     """
-    Clean the Kaggle dataset and export processed_movies.csv.
+    Clean the Kaggle dataset and export processed_movies.csv, plus the SQLite
+    catalog built from it (see ``pipelines.catalog_db``).
 
     Args:
         raw_source: Optional override for the raw CSV path.
         output_path: Optional override for the processed CSV path.
+        db_path: Optional override for the catalog database path.
     Returns:
         Path to the processed dataset.
     """
@@ -104,6 +112,8 @@ def clean_movies_dataset(
         "overview",
         "genres_list",
         "production_companies_list",
+        # The API derives card URLs and srcsets (incl. local poster variants) from the raw path
+        "poster_path",
         "poster_url",
         "runtime",
         "original_language",
@@ -122,8 +132,54 @@ def clean_movies_dataset(
 
     processed_file.parent.mkdir(parents=True, exist_ok=True)
     final_df.to_csv(processed_file, index=False)
+    build_catalog_db(processed_file, db_path)
     return processed_file
 
 
-__all__ = ["clean_movies_dataset", "RAW_DATA_PATH", "PROCESSED_DATA_PATH"]
+def clean_if_changed(
+    raw_source: str | Path | None = None,
+    output_path: str | Path | None = None,
+    db_path: str | Path | None = None,
+) -> dict:
+    """
+    Run ``clean_movies_dataset`` unless the raw input and processed output are
+    unchanged since the last recorded run.
+
+    Returns:
+        Stage summary (fingerprints, row count, duration, whether it was skipped),
+        suitable as an Airflow task output.
+    """
+
+    started = time.perf_counter()
+    raw_file = Path(raw_source) if raw_source else RAW_DATA_PATH
+    processed_file = Path(output_path) if output_path else PROCESSED_DATA_PATH
+    catalog_db = Path(db_path) if db_path else CATALOG_DB_PATH
+
+    input_fp = file_fingerprint(raw_file)
+    if input_fp is None:
+        raise FileNotFoundError(f"Raw dataset not found at {raw_file}")
+
+    previous = load_manifest().get("clean", {})
+    if (
+        previous.get("input_fingerprint") == input_fp
+        and previous.get("output_path") == str(processed_file)
+        and file_fingerprint(processed_file) == previous.get("output_fingerprint")
+        and file_fingerprint(catalog_db) == previous.get("catalog_db_fingerprint")
+    ):
+        return {**previous, "skipped": True, "seconds": round(time.perf_counter() - started, 3)}
+
+    clean_movies_dataset(raw_file, processed_file, catalog_db)
+    record = {
+        "input_fingerprint": input_fp,
+        "output_fingerprint": file_fingerprint(processed_file),
+        "output_path": str(processed_file),
+        "catalog_db_fingerprint": file_fingerprint(catalog_db),
+        "catalog_db_path": str(catalog_db),
+        "rows": int(len(pd.read_csv(processed_file, usecols=["id"]))),
+    }
+    update_manifest("clean", record)
+    return {**record, "skipped": False, "seconds": round(time.perf_counter() - started, 3)}
+
+
+__all__ = ["clean_movies_dataset", "clean_if_changed", "RAW_DATA_PATH", "PROCESSED_DATA_PATH"]
 
@@ -0,0 +1,70 @@
+"""
+Embedding backends shared by the pipelines and local tooling.
+
+Ollama is the production embedder. ``HashEmbeddings`` is a deterministic,
+dependency-free stand-in used by benchmarks and local pipeline runs so they
+do not need a running Ollama server.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import re
+
+DEFAULT_DIMENSIONS = 64
+OLLAMA_MODEL = "nomic-embed-text"
+# "ollama" (default) or "hash"; lets local DAG runs swap in the fake embedder
+EMBEDDINGS_ENV_VAR = "FARAGNY_EMBEDDINGS"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class HashEmbeddings:
+    """
+    Feature-hashing embedder with the LangChain ``Embeddings`` interface.
+
+    Every token is hashed into one of ``dimensions`` buckets with a signed
+    weight, and the result is L2-normalised. The same text always maps to the
+    same vector, and texts sharing words end up close to each other, which is
+    enough to exercise the vector store realistically.
+    """
+
+    def __init__(self, dimensions: int = DEFAULT_DIMENSIONS) -> None:
+        self.dimensions = dimensions
+
+    def _embed(self, text: str) -> list[float]:
+        vector = [0.0] * self.dimensions
+        for token in _TOKEN_RE.findall(text.lower()):
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dimensions
+            sign = 1.0 if digest[4] & 1 else -1.0
+            vector[bucket] += sign
+        norm = math.sqrt(sum(v * v for v in vector))
+        if norm == 0:
+            # Empty text still needs a valid, non-zero vector for cosine/L2 search
+            vector[0] = 1.0
+            return vector
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._embed(text)
+
+
+def get_embeddings(kind: str | None = None):
+    """Return the configured embedder (``$FARAGNY_EMBEDDINGS``, default Ollama)."""
+    kind = (kind or os.environ.get(EMBEDDINGS_ENV_VAR) or "ollama").lower()
+    if kind == "hash":
+        return HashEmbeddings()
+    if kind == "ollama":
+        from langchain_ollama import OllamaEmbeddings
+
+        return OllamaEmbeddings(model=OLLAMA_MODEL)
+    raise ValueError(f"Unknown embeddings backend {kind!r}; expected 'ollama' or 'hash'")
+
+
+__all__ = ["HashEmbeddings", "get_embeddings", "DEFAULT_DIMENSIONS", "EMBEDDINGS_ENV_VAR"]
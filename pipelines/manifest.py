@@ -0,0 +1,50 @@
+"""
+Content fingerprints and the run manifest used to skip unchanged pipeline stages.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+MANIFEST_PATH = Path("data") / "pipeline_manifest.json"
+
+
+def file_fingerprint(path: str | Path) -> str | None:
+    """SHA-256 of a file's contents, or None if it does not exist."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_manifest(path: str | Path | None = None) -> dict[str, Any]:
+    manifest_file = Path(path) if path else MANIFEST_PATH
+    if not manifest_file.exists():
+        return {}
+    try:
+        return json.loads(manifest_file.read_text())
+    except ValueError:
+        # A corrupt manifest only costs a full rebuild
+        return {}
+
+
+def update_manifest(stage: str, record: dict[str, Any], path: str | Path | None = None) -> None:
+    """Replace one stage's record, writing the file atomically."""
+    manifest_file = Path(path) if path else MANIFEST_PATH
+    manifest = load_manifest(manifest_file)
+    manifest[stage] = record
+    manifest_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = manifest_file.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    os.replace(tmp, manifest_file)
+
+
+__all__ = ["MANIFEST_PATH", "file_fingerprint", "load_manifest", "update_manifest"]
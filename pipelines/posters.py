@@ -0,0 +1,93 @@
+"""
+Generate resized, content-hashed WebP variants of local poster images.
+
+Variants are written to ``data/posters/derived/`` as ``<hash>-w<width>.webp``,
+where the hash covers the source bytes, so a URL never changes meaning and
+can be cached forever. ``manifest.json`` maps each source path (relative to
+``data/``, as stored in ``poster_path``) to its variants; the API reads it to
+build ``poster_url`` and ``poster_srcset``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from pipelines.clean_data import DATA_DIR
+
+DERIVED_DIR = DATA_DIR / "posters" / "derived"
+MANIFEST_NAME = "manifest.json"
+# Row cards, 2x row cards / small screens, detail view
+POSTER_WIDTHS = (185, 342, 500)
+WEBP_QUALITY = 80
+SOURCE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp"}
+
+
+def _iter_sources(data_dir: Path, derived_dir: Path):
+    for path in sorted(data_dir.rglob("*")):
+        if path.suffix.lower() in SOURCE_SUFFIXES and derived_dir not in path.parents:
+            yield path
+
+
+def generate_poster_variants(data_dir: str | Path | None = None) -> dict:
+    """
+    Create missing variants for every local poster under ``data_dir`` and
+    rewrite the manifest. Unchanged posters are not re-encoded.
+
+    Returns:
+        Stage summary (posters seen, variants written, stale files removed, duration).
+    """
+
+    try:
+        from PIL import Image
+    except ImportError as exc:  # optional: only needed where posters are processed
+        raise RuntimeError("Poster variants need Pillow: pip install pillow") from exc
+
+    started = time.perf_counter()
+    root = Path(data_dir) if data_dir else DATA_DIR
+    derived = root / DERIVED_DIR.relative_to(DATA_DIR)
+    derived.mkdir(parents=True, exist_ok=True)
+
+    manifest: dict[str, dict[str, str]] = {}
+    written = 0
+    for source in _iter_sources(root, derived):
+        digest = hashlib.sha256(source.read_bytes()).hexdigest()[:16]
+        variants: dict[str, str] = {}
+        # Opening only parses the header; pixels are decoded on first resize
+        with Image.open(source) as image:
+            # Never upscale: skip widths the source cannot fill (but always keep the smallest)
+            widths = [w for w in POSTER_WIDTHS if w <= image.width] or [POSTER_WIDTHS[0]]
+            for width in widths:
+                target = derived / f"{digest}-w{width}.webp"
+                if not target.exists():
+                    frame = image if image.mode in ("RGB", "RGBA") else image.convert("RGB")
+                    size = (min(width, image.width), max(1, round(image.height * min(width, image.width) / image.width)))
+                    tmp = target.with_suffix(".tmp")
+                    frame.resize(size, Image.LANCZOS).save(tmp, format="WEBP", quality=WEBP_QUALITY, method=6)
+                    os.replace(tmp, target)
+                    written += 1
+                variants[str(width)] = target.relative_to(root).as_posix()
+        manifest[source.relative_to(root).as_posix()] = variants
+
+    keep = {name.rsplit("/", 1)[-1] for variants in manifest.values() for name in variants.values()}
+    removed = 0
+    for stale in derived.glob("*.webp"):
+        if stale.name not in keep:
+            stale.unlink()
+            removed += 1
+
+    tmp_manifest = derived / (MANIFEST_NAME + ".tmp")
+    tmp_manifest.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    os.replace(tmp_manifest, derived / MANIFEST_NAME)
+    return {
+        "posters": len(manifest),
+        "variants_written": written,
+        "stale_removed": removed,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+__all__ = ["generate_poster_variants", "DERIVED_DIR", "POSTER_WIDTHS"]
@@ -1,42 +1,78 @@
 """
 Utility to rebuild the Chroma vector store from the processed movie dataset.
+
+The build is split into shards so it can fan out across Airflow workers:
+
+1. ``plan_shards`` cuts the dataset into row ranges with a content fingerprint each
+   and writes each range's records to ``db/vector_shards/inputs/``, so the dataset
+   is parsed once per run rather than once per shard.
+2. ``build_shard`` embeds one shard's records into ``db/vector_shards/`` (skipped if
+   a shard with the same fingerprint and embedder already exists).
+3. ``merge_shards`` loads every shard into a fresh collection and swaps it in
+   (skipped if the shard set matches the live store).
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
+import os
 import shutil
+import time
 from pathlib import Path
-from typing import List
+from typing import Any, List
 
+import numpy as np
 import pandas as pd
-from langchain.docstore.document import Document
-from langchain_chroma import Chroma
-from langchain_ollama import OllamaEmbeddings
 
-from pipelines.clean_data import PROCESSED_DATA_PATH
+from backend.app.services import vector_layout
+from pipelines.clean_data import PROCESSED_DATA_PATH, _to_name_list
+from pipelines.embeddings import get_embeddings
+from pipelines.manifest import file_fingerprint, load_manifest, update_manifest
 
-PERSIST_DIR = Path("db/chroma_store")
-COLLECTION_NAME = "movies"
+# Same location and collection the API opens
+PERSIST_DIR = Path(vector_layout.PERSIST_DIR)
+COLLECTION_NAME = vector_layout.COLLECTION_NAME
+# Written into the store directory; the API keys derived data (taste vectors) on it
+STORE_VERSION_FILE = vector_layout.STORE_VERSION_FILE
+SHARDS_DIR = Path("db/vector_shards")
+SHARD_INPUTS_DIR = SHARDS_DIR / "inputs"
+DEFAULT_SHARD_SIZE = 5_000
+EMBED_BATCH_SIZE = 256
 
 
 def _load_movies(processed_path: Path) -> pd.DataFrame:
     if not processed_path.exists():
         raise FileNotFoundError(f"Processed dataset not found at {processed_path}")
-    return pd.read_csv(processed_path)
+    df = pd.read_csv(processed_path)
+    # Chroma ids must be unique; keep the first row per movie like the API does
+    return df.drop_duplicates(subset="id", keep="first").reset_index(drop=True)
+
 
+def _scalar(value: Any) -> Any:
+    """Chroma metadata only accepts non-null scalars."""
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
 
-def _to_documents(df: pd.DataFrame) -> List[Document]:
-    documents: List[Document] = []
+
+def _to_records(df: pd.DataFrame) -> List[dict]:
+    records: List[dict] = []
     for _, row in df.iterrows():
-        description = row.get("overview") or ""
+        description = row.get("overview")
+        description = description if isinstance(description, str) else ""
         title = row.get("title") or "Untitled"
-        genres = row.get("genres") or []
-        production = row.get("production_companies") or []
+        genres = _to_name_list(row.get("genres"))
+        production = _to_name_list(row.get("production_companies"))
         metadata = {
             "id": int(row["id"]),
-            "title": title,
-            "genres": genres,
-            "production_companies": production,
+            # The backend reads movie ids from this key
+            "movie_id": int(row["id"]),
+            "title": str(title),
+            "genres": ", ".join(genres),
+            "production_companies": ", ".join(production),
             "poster_url": row.get("poster_url"),
             "runtime": row.get("runtime"),
             "original_language": row.get("original_language"),
@@ -44,33 +80,199 @@ def _to_documents(df: pd.DataFrame) -> List[Document]:
             "vote_count": row.get("vote_count"),
             "popularity": row.get("popularity"),
         }
+        metadata = {k: _scalar(v) for k, v in metadata.items()}
         content = f"{title}\nGenres: {', '.join(genres)}\nOverview: {description}"
-        documents.append(Document(page_content=content, metadata=metadata))
-    return documents
+        records.append(
+            {
+                "id": str(int(row["id"])),
+                "document": content,
+                "metadata": {k: v for k, v in metadata.items() if v is not None},
+            }
+        )
+    return records
 
 
-def refresh_vector_store(processed_path: str | Path | None = None) -> None:
+def _embedder_key(embeddings) -> str:
+    """Identify the embedder so switching models invalidates existing shards."""
+    detail = getattr(embeddings, "model", None) or getattr(embeddings, "dimensions", "")
+    return f"{type(embeddings).__name__}:{detail}"
+
+
+def _write_json(path: Path, payload: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(payload))
+    os.replace(tmp, path)
+
+
+def plan_shards(
+    processed_path: str | Path | None = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+) -> List[dict]:
     """
-    Rebuild the Chroma vector store from the processed dataset.
+    Split the processed dataset into row ranges with a content fingerprint each.
+
+    Each shard's records are written to ``SHARD_INPUTS_DIR`` (named by their
+    fingerprint, so unchanged shards keep their file) for ``build_shard`` to
+    read. If the processed file is unchanged since the last successful merge
+    and those files are still there, the recorded plan is returned without
+    re-reading the dataset.
     """
 
     dataset_path = Path(processed_path) if processed_path else PROCESSED_DATA_PATH
+    dataset_fp = file_fingerprint(dataset_path)
+    if dataset_fp is None:
+        raise FileNotFoundError(f"Processed dataset not found at {dataset_path}")
+
+    previous = load_manifest().get("vectors", {})
+    if (
+        previous.get("input_fingerprint") == dataset_fp
+        and previous.get("shard_size") == shard_size
+        and all(shard.get("input_path") and Path(shard["input_path"]).exists() for shard in previous["shards"])
+    ):
+        return previous["shards"]
+
     df = _load_movies(dataset_path)
-    documents = _to_documents(df)
+    shards: List[dict] = []
+    for index, start in enumerate(range(0, len(df), shard_size)):
+        stop = min(start + shard_size, len(df))
+        records = _to_records(df.iloc[start:stop])
+        digest = hashlib.sha256(json.dumps(records, sort_keys=True).encode()).hexdigest()
+        input_path = SHARD_INPUTS_DIR / f"input-{digest[:32]}.json"
+        if not input_path.exists():
+            _write_json(input_path, records)
+        shards.append(
+            {
+                "index": index,
+                "start": start,
+                "stop": stop,
+                "fingerprint": digest,
+                "input_path": str(input_path),
+                "processed_path": str(dataset_path),
+                "dataset_fingerprint": dataset_fp,
+                "shard_size": shard_size,
+            }
+        )
+    return shards
+
+
+def build_shard(shard: dict, embeddings=None) -> dict:
+    """
+    Embed one planned shard into ``SHARDS_DIR``.
+
+    Returns:
+        Stage summary (shard file, row count, duration, whether it was skipped).
+    """
+
+    started = time.perf_counter()
+    embeddings = embeddings or get_embeddings()
+    key = hashlib.sha256(_embedder_key(embeddings).encode()).hexdigest()[:12]
+    shard_file = SHARDS_DIR / f"shard-{shard['fingerprint'][:32]}-{key}.npz"
+    summary = {
+        "index": shard["index"],
+        "path": str(shard_file),
+        "rows": shard["stop"] - shard["start"],
+        "plan": shard,
+    }
+    if shard_file.exists():
+        return {**summary, "skipped": True, "seconds": round(time.perf_counter() - started, 3)}
 
+    records = json.loads(Path(shard["input_path"]).read_text())
+    vectors: List[List[float]] = []
+    for offset in range(0, len(records), EMBED_BATCH_SIZE):
+        batch = records[offset : offset + EMBED_BATCH_SIZE]
+        vectors.extend(embeddings.embed_documents([r["document"] for r in batch]))
+
+    SHARDS_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = shard_file.with_suffix(".tmp.npz")
+    np.savez(
+        tmp,
+        embeddings=np.asarray(vectors, dtype=np.float32),
+        records=np.array(json.dumps(records)),
+    )
+    os.replace(tmp, shard_file)
+    return {**summary, "skipped": False, "seconds": round(time.perf_counter() - started, 3)}
+
+
+def merge_shards(shard_results: List[dict]) -> dict:
+    """
+    Load every built shard into a fresh Chroma collection and swap it into ``PERSIST_DIR``.
+
+    Returns:
+        Stage summary (row count, duration, whether it was skipped).
+    """
+
+    import chromadb
+
+    started = time.perf_counter()
+    results = sorted(shard_results, key=lambda r: r["index"])
+    shard_paths = [r["path"] for r in results]
+    merged_fp = hashlib.sha256("\n".join(shard_paths).encode()).hexdigest()
+    rows = sum(r["rows"] for r in results)
+
+    previous = load_manifest().get("vectors", {})
+    if previous.get("merged_fingerprint") == merged_fp and PERSIST_DIR.exists():
+        return {"rows": rows, "shards": len(results), "skipped": True, "seconds": round(time.perf_counter() - started, 3)}
+
+    staging = PERSIST_DIR.with_name(PERSIST_DIR.name + ".staging")
+    if staging.exists():
+        shutil.rmtree(staging)
+    client = chromadb.PersistentClient(path=str(staging))
+    collection = client.get_or_create_collection(COLLECTION_NAME)
+    max_batch = client.get_max_batch_size()
+    for path in shard_paths:
+        with np.load(path) as shard:
+            vectors = shard["embeddings"]
+            records = json.loads(str(shard["records"]))
+        for offset in range(0, len(records), max_batch):
+            batch = records[offset : offset + max_batch]
+            collection.add(
+                ids=[r["id"] for r in batch],
+                documents=[r["document"] for r in batch],
+                metadatas=[r["metadata"] for r in batch],
+                embeddings=vectors[offset : offset + max_batch],
+            )
+    del collection, client
+    (staging / STORE_VERSION_FILE).write_text(merged_fp)
+
+    # Swap the new store in, then drop shards no longer referenced by the plan
     if PERSIST_DIR.exists():
         shutil.rmtree(PERSIST_DIR)
-    PERSIST_DIR.mkdir(parents=True, exist_ok=True)
+    staging.rename(PERSIST_DIR)
+    keep = {Path(p).name for p in shard_paths}
+    for stale in SHARDS_DIR.glob("shard-*.npz"):
+        if stale.name not in keep:
+            stale.unlink()
+    plan = [r["plan"] for r in results]
+    keep_inputs = {Path(shard["input_path"]).name for shard in plan}
+    for stale in SHARD_INPUTS_DIR.glob("input-*.json"):
+        if stale.name not in keep_inputs:
+            stale.unlink()
 
-    embeddings = OllamaEmbeddings(model="nomic-embed-text")
-    db = Chroma(
-        collection_name=COLLECTION_NAME,
-        persist_directory=str(PERSIST_DIR),
-        embedding_function=embeddings,
+    update_manifest(
+        "vectors",
+        {
+            "merged_fingerprint": merged_fp,
+            "input_fingerprint": plan[0]["dataset_fingerprint"] if plan else None,
+            "shard_size": plan[0]["shard_size"] if plan else None,
+            "shards": plan,
+            "rows": rows,
+        },
     )
-    db.add_documents(documents)
-    db.persist()
+    return {"rows": rows, "shards": len(results), "skipped": False, "seconds": round(time.perf_counter() - started, 3)}
+
+
+def refresh_vector_store(processed_path: str | Path | None = None) -> None:
+    """
+    Rebuild the Chroma vector store from the processed dataset.
+
+    Runs the shard plan sequentially in-process; the Airflow DAG runs the
+    same steps with one mapped task per shard.
+    """
 
+    shards = plan_shards(processed_path)
+    embeddings = get_embeddings()
+    merge_shards([build_shard(shard, embeddings) for shard in shards])
 
-__all__ = ["refresh_vector_store"]
 
+__all__ = ["refresh_vector_store", "plan_shards", "build_shard", "merge_shards"]